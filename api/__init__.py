@@ -0,0 +1,18 @@
+"""
+Headless access to the engine: a pool of warm worker processes serving
+parse, simplify, factor, expand, solve and explain requests, exposed as
+JSON-RPC over stdin/stdout or HTTP:
+
+    python -m api stdio
+    python -m api http --port 8000
+
+    {"jsonrpc": "2.0", "id": 1, "method": "solve",
+     "params": {"expr": "x^2 - 5x + 6 = 0", "timeout": 5, "trace": true}}
+
+AsyncEngine offers the same requests to asyncio code.
+"""
+
+from .worker import *
+from .pool import *
+from .server import *
+from .aio import *
@@ -0,0 +1,35 @@
+import argparse
+import multiprocessing
+import sys
+
+from .pool import Pool
+from .server import serve_http, serve_stdio
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m api", description="Serve the algebra engine over JSON-RPC"
+    )
+    parser.add_argument("transport", choices=["stdio", "http"])
+    parser.add_argument("-w", "--workers", type=int, help="worker processes")
+    parser.add_argument(
+        "-t", "--timeout", type=float, help="default per-request timeout (seconds)"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=8000)
+
+    args = parser.parse_args(argv)
+    with Pool(args.workers) as pool:
+        if args.transport == "stdio":
+            serve_stdio(pool, args.timeout)
+        else:
+            try:
+                serve_http(pool, args.host, args.port, args.timeout)
+            except KeyboardInterrupt:
+                pass
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
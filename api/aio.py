@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Generator
+import asyncio
+
+from .pool import Pool
+
+
+class StepStream:
+    """
+    The steps of a request, as an async iterator over their JSON while the
+    worker computes. Awaiting the stream gives the final reply.
+    """
+
+    def __init__(self, pool: Pool, method: str, expr: str, **params):
+        loop = asyncio.get_running_loop()
+        self._steps: asyncio.Queue = asyncio.Queue()
+        self._pool = pool
+        self._fut = pool.submit(
+            method,
+            expr,
+            **params,
+            listener=lambda step: loop.call_soon_threadsafe(
+                self._steps.put_nowait, step
+            ),
+        )
+
+    def __aiter__(self) -> AsyncIterator[str | list]:
+        return self
+
+    async def __anext__(self) -> str | list:
+        try:
+            step = await self._steps.get()
+        except asyncio.CancelledError:
+            self._pool.cancel(self._fut)
+            raise
+        if step is None:
+            raise StopAsyncIteration
+        return step
+
+    def __await__(self) -> Generator[Any, None, dict]:
+        return _wait(self._pool, self._fut).__await__()
+
+    def cancel(self) -> None:
+        self._pool.cancel(self._fut)
+
+
+async def _wait(pool: Pool, fut: Future[dict]) -> dict:
+    """Await a pool request, cancelling it if the awaiting task is cancelled"""
+    try:
+        return await asyncio.wrap_future(fut)
+    except asyncio.CancelledError:
+        pool.cancel(fut)
+        raise
+
+
+class AsyncEngine:
+    """
+    Asyncio front end to a worker Pool: requests are computed in other
+    processes, so awaiting them never blocks the event loop. Cancelling the
+    awaiting task cancels the request in its worker.
+    """
+
+    def __init__(self, pool: Pool | None = None, workers: int | None = None):
+        self._owned = pool is None
+        self.pool = pool if pool is not None else Pool(workers)
+
+    async def evaluate(
+        self,
+        method: str,
+        expr: str,
+        vars: list[str] | None = None,
+        timeout: float | None = None,
+        trace: bool | dict = False,
+    ) -> dict:
+        """See worker.evaluate for the reply format"""
+        return await _wait(
+            self.pool, self.pool.submit(method, expr, vars, timeout, trace)
+        )
+
+    async def parse(self, expr: str, **kwargs) -> dict:
+        return await self.evaluate("parse", expr, **kwargs)
+
+    async def simplify(self, expr: str, **kwargs) -> dict:
+        return await self.evaluate("simplify", expr, **kwargs)
+
+    async def factor(self, expr: str, **kwargs) -> dict:
+        return await self.evaluate("factor", expr, **kwargs)
+
+    async def expand(self, expr: str, **kwargs) -> dict:
+        return await self.evaluate("expand", expr, **kwargs)
+
+    async def solve(self, expr: str, vars: list[str] | None = None, **kwargs) -> dict:
+        return await self.evaluate("solve", expr, vars, **kwargs)
+
+    async def explain(self, expr: str, **kwargs) -> dict:
+        return await self.evaluate("explain", expr, **kwargs)
+
+    def stream(
+        self,
+        method: str,
+        expr: str,
+        vars: list[str] | None = None,
+        timeout: float | None = None,
+        trace: bool | dict = False,
+    ) -> StepStream:
+        """
+        Stream the steps of a request as they are made:
+
+            stream = engine.stream("solve", "x^2 - 5x + 6 = 0")
+            async for step in stream:
+                ...
+            reply = await stream
+        """
+        return StepStream(
+            self.pool, method, expr, vars=vars, timeout=timeout, trace=trace
+        )
+
+    def close(self) -> None:
+        if self._owned:
+            self.pool.close()
+
+    async def __aenter__(self) -> AsyncEngine:
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        # Shutting the pool down waits for its workers
+        await asyncio.to_thread(self.close)
+
+
+__all__ = ["AsyncEngine", "StepStream"]
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable
+import concurrent.futures
+import itertools
+import multiprocessing
+import threading
+
+from . import worker
+
+
+class Pool:
+    """
+    Warm worker processes for evaluating requests. Each running request
+    owns a slot in a shared array of cancel flags, which the workers poll
+    at their checkpoints, so it can be cancelled without killing a worker.
+    Streamed steps come back through a shared queue, tagged by request.
+    """
+
+    def __init__(self, workers: int | None = None, slots: int = 256):
+        ctx = multiprocessing.get_context()
+        self._flags = ctx.RawArray("b", slots)
+        self._free = list(range(slots))
+        self._slots = threading.Semaphore(slots)
+        self._lock = threading.Lock()
+        # The request each slot is held by: cancelling a finished request
+        # must not flag whichever one took its slot next
+        self._owners: dict[int, Future] = {}
+        self._events = ctx.Queue()
+        self._listeners: dict[int, Callable[[Any], None]] = {}
+        self._ids = itertools.count()
+        self._dispatcher = None
+        self._executor = ProcessPoolExecutor(
+            workers,
+            mp_context=ctx,
+            initializer=worker.initialize,
+            initargs=(self._flags, self._events),
+        )
+
+    def submit(
+        self,
+        method: str,
+        expr: str,
+        vars: list[str] | None = None,
+        timeout: float | None = None,
+        trace: bool | dict = False,
+        listener: Callable[[Any], None] | None = None,
+    ) -> Future[dict]:
+        """
+        Evaluate a request in a worker. Blocks while all slots are in use.
+        `listener` is called (from another thread) with the JSON of each
+        top-level step as it is made, then with None once there are no more.
+        """
+        slot, stream = self._acquire(), None
+        if listener is not None:
+            with self._lock:
+                self._listeners[stream := next(self._ids)] = listener
+                if self._dispatcher is None:
+                    self._dispatcher = threading.Thread(
+                        target=self._dispatch, daemon=True
+                    )
+                    self._dispatcher.start()
+        fut = self._executor.submit(
+            worker.evaluate, method, expr, vars, timeout, trace, slot, stream
+        )
+        self._own(fut, slot, stream)
+        return fut
+
+    def call(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        timeout: float | None = None,
+        verbose: bool = False,
+    ) -> Future:
+        """
+        Run `fn(*args)` in a worker, cancellable like a request. `fn`, its
+        arguments and its result must be picklable, and its errors are
+        raised by the future. With `verbose`, steps are recorded.
+        """
+        slot = self._acquire()
+        fut = self._executor.submit(worker.call, fn, args, slot, timeout, verbose)
+        self._own(fut, slot, None)
+        return fut
+
+    def _acquire(self) -> int:
+        self._slots.acquire()
+        with self._lock:
+            slot = self._free.pop()
+            self._flags[slot] = 0
+        return slot
+
+    def _own(self, fut: Future, slot: int, stream: int | None) -> None:
+        fut.slot, fut.stream = slot, stream
+        with self._lock:
+            self._owners[slot] = fut
+        fut.add_done_callback(self._release)
+
+    def _release(self, fut: Future) -> None:
+        with self._lock:
+            del self._owners[fut.slot]
+            self._free.append(fut.slot)
+        self._slots.release()
+        # The worker never ran the request, so it won't end the stream
+        if fut.stream is not None and (fut.cancelled() or fut.exception()):
+            self._events.put((fut.stream, None))
+
+    def _dispatch(self) -> None:
+        while (event := self._events.get()) is not None:
+            stream, step = event
+            if step is None:
+                listener = self._listeners.pop(stream, None)
+            else:
+                listener = self._listeners.get(stream)
+            if listener is not None:
+                listener(step)
+
+    def cancel(self, fut: Future) -> None:
+        """Cancel a pending request, or stop a running one at its next checkpoint"""
+        if fut.cancel():
+            return
+        with self._lock:
+            if self._owners.get(fut.slot) is fut:
+                self._flags[fut.slot] = 1
+
+    def evaluate(
+        self,
+        method: str,
+        expr: str,
+        vars: list[str] | None = None,
+        timeout: float | None = None,
+        trace: bool | dict = False,
+    ) -> dict:
+        """
+        Evaluate a request and wait for its reply. The worker enforces
+        `timeout` at its checkpoints; waiting gives up shortly after.
+        """
+        fut = self.submit(method, expr, vars, timeout, trace)
+        return self.result(fut, None if timeout is None else timeout + GRACE)
+
+    def result(self, fut: Future[dict], timeout: float | None = None) -> dict:
+        """The reply to a submitted request, cancelling it after `timeout`"""
+        try:
+            return fut.result(timeout)
+        except concurrent.futures.TimeoutError:
+            self.cancel(fut)
+            return {"error": {"type": "Timeout", "message": "operation timed out"}}
+        except concurrent.futures.CancelledError:
+            return {
+                "error": {"type": "Cancelled", "message": "operation was cancelled"}
+            }
+        except Exception as e:
+            return {"error": {"type": type(e).__name__, "message": str(e)}}
+
+    def close(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+        self._events.put(None)
+
+    def __enter__(self) -> Pool:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# Seconds to wait past a request's timeout before giving up on the worker
+GRACE = 1.0
+
+__all__ = ["Pool"]
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import IO, Any
+import concurrent.futures
+import json
+import sys
+import threading
+
+from .pool import Pool
+from .worker import METHODS
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+# Server defined: the engine raised an error, or ran out of time
+EVALUATION_ERROR = -32000
+TIMEOUT_ERROR = -32001
+
+PARAMS = {"expr", "vars", "timeout", "trace"}
+# The keyword arguments of steps.limit_trace, for "trace": {...}
+TRACE_LIMITS = {"maxdepth", "maxsteps", "maxchildren"}
+
+
+def _error(id: Any, code: int, message: str, data: Any = None) -> dict:
+    err = {"code": code, "message": message}
+    if data is not None:
+        err["data"] = data
+    return {"jsonrpc": "2.0", "id": id, "error": err}
+
+
+def _check(request: Any) -> dict | None:
+    """Error response for a malformed request, None if it is valid"""
+    id = request.get("id") if isinstance(request, dict) else None
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        return _error(id, INVALID_REQUEST, "Invalid Request")
+    if request["method"] not in METHODS:
+        return _error(id, METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+    if (message := _check_params(request.get("params", {}))) is not None:
+        return _error(id, INVALID_PARAMS, f"Invalid params: {message}")
+
+
+def _check_params(params: Any) -> str | None:
+    """What is wrong with the params of a request, None if they are valid"""
+    if (
+        not isinstance(params, dict)
+        or not isinstance(params.get("expr"), str)
+        or not params.keys() <= PARAMS
+    ):
+        return "expected {'expr': str}"
+    timeout = params.get("timeout")
+    if timeout is not None and (
+        timeout.__class__ not in (int, float) or not timeout > 0
+    ):
+        return "'timeout' must be a positive number or null"
+    vars = params.get("vars")
+    if vars is not None and (
+        not isinstance(vars, list) or not all(isinstance(v, str) for v in vars)
+    ):
+        return "'vars' must be a list of strings"
+    trace = params.get("trace", False)
+    if isinstance(trace, dict):
+        if not trace.keys() <= TRACE_LIMITS or not all(
+            v is None or v.__class__ is int and v >= 0 for v in trace.values()
+        ):
+            return f"'trace' limits must be among {sorted(TRACE_LIMITS)}, as integers"
+    elif trace.__class__ is not bool:
+        return "'trace' must be a boolean or an object of limits"
+
+
+def _reply(id: Any, res: dict) -> dict:
+    if "error" not in res:
+        return {"jsonrpc": "2.0", "id": id, "result": res}
+    err = res["error"]
+    code = TIMEOUT_ERROR if err["type"] == "Timeout" else EVALUATION_ERROR
+    return _error(id, code, err["message"], {"type": err["type"]})
+
+
+def handle(pool: Pool, request: Any, timeout: float | None = None) -> dict:
+    """
+    Evaluate a JSON-RPC request (already decoded) and return its response.
+    `timeout` is the default for requests that don't set their own.
+    """
+    if (err := _check(request)) is not None:
+        return err
+    params = {"timeout": timeout, **request.get("params", {})}
+    return _reply(request.get("id"), pool.evaluate(request["method"], **params))
+
+
+def serve_stdio(
+    pool: Pool,
+    timeout: float | None = None,
+    stdin: IO[str] = sys.stdin,
+    stdout: IO[str] = sys.stdout,
+) -> None:
+    """
+    Line delimited JSON-RPC over stdin/stdout. Requests are evaluated
+    concurrently, so responses may come out of order. A "cancel" request
+    with {"id": ...} cancels a pending request.
+    """
+    lock = threading.Lock()
+    pending: dict[Any, Future] = {}
+
+    def write(response: dict) -> None:
+        with lock:
+            stdout.write(json.dumps(response) + "\n")
+            stdout.flush()
+
+    def done(id: Any, fut: Future) -> None:
+        pending.pop(id, None)
+        try:
+            response = _reply(id, pool.result(fut))
+        except Exception as e:
+            # Every request gets a response
+            response = _error(id, INTERNAL_ERROR, f"Internal error: {e}")
+        write(response)
+
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            write(_error(None, PARSE_ERROR, f"Parse error: {e}"))
+            continue
+        if isinstance(request, dict) and request.get("method") == "cancel":
+            params = request.get("params")
+            if isinstance(params, dict) and (fut := pending.get(params.get("id"))):
+                pool.cancel(fut)
+            write({"jsonrpc": "2.0", "id": request.get("id"), "result": None})
+            continue
+        if (err := _check(request)) is not None:
+            write(err)
+            continue
+        id = request.get("id")
+        params = {"timeout": timeout, **request.get("params", {})}
+        pending[id] = fut = pool.submit(request["method"], **params)
+        fut.add_done_callback(lambda fut, id=id: done(id, fut))
+    # Finish the requests still in flight before returning
+    concurrent.futures.wait(list(pending.values()))
+
+
+def serve_http(
+    pool: Pool, host: str = "127.0.0.1", port: int = 8000, timeout: float | None = None
+) -> None:
+    """JSON-RPC over HTTP: POST a request to any path"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            try:
+                size = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(size))
+            except (ValueError, json.JSONDecodeError) as e:
+                response = _error(None, PARSE_ERROR, f"Parse error: {e}")
+            else:
+                response = handle(pool, request, timeout)
+            body = json.dumps(response).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with ThreadingHTTPServer((host, port), Handler) as server:
+        server.serve_forever()
+
+
+__all__ = ["handle", "serve_stdio", "serve_http"]
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+import contextlib
+import ctypes
+import multiprocessing
+
+from datatypes.expr import Var
+from parsing import parser
+from solving.system import System
+import utils
+import utils.limits as limits
+import utils.steps as steps
+
+
+class SharedToken(limits.CancelToken):
+    """
+    CancelToken whose flag lives in memory shared with the parent process,
+    so a request can be cancelled while a worker is busy computing it.
+    """
+
+    __slots__ = ("slot",)
+
+    def __init__(self, slot: int, timeout: float | None = None):
+        super().__init__(timeout)
+        self.slot = slot
+
+    def cancel(self) -> None:
+        _flags[self.slot] = 1
+
+    @property
+    def cancelled(self) -> bool:
+        return bool(_flags[self.slot])
+
+
+def _simplify(expr: str):
+    return parser.parse(expr, False)
+
+
+def _factor(expr: str):
+    return utils.factor(_simplify(expr))
+
+
+def _expand(expr: str):
+    return _simplify(expr).expand()
+
+
+def _solve(expr: str, vars: list[str] | None = None):
+    if not vars:
+        return parser.parse(expr)
+    res = _simplify(expr)
+    if res.__class__ is System:
+        return res.solve_for([Var(v) for v in vars])
+    return res.solve_for(Var(vars[0]))
+
+
+METHODS: dict[str, Callable[..., Any]] = {
+    "parse": lambda expr: repr(parser.AST(expr)),
+    "simplify": _simplify,
+    "factor": _factor,
+    "expand": _expand,
+    "solve": _solve,
+    "explain": parser.parse,
+}
+
+
+def evaluate(
+    method: str,
+    expr: str,
+    vars: list[str] | None = None,
+    timeout: float | None = None,
+    trace: bool | dict = False,
+    slot: int | None = None,
+    stream: int | None = None,
+) -> dict:
+    """
+    Run `method` on the input `expr`. The reply is JSON serializable:
+    {"result": str, "tex": str, "steps": Step.toJSON()} on success and
+    {"error": {"type": name, "message": str}} otherwise. "steps" is only
+    included when `trace` is set (always for "explain"). `trace` can also
+    be the keyword arguments of steps.limit_trace, to record less.
+    With `stream`, top-level steps are also sent to the pool as they are
+    made, tagged with `stream`, followed by None.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown method: '{method}'")
+    limit = trace if isinstance(trace, dict) else {}
+    trace = isinstance(trace, dict) or bool(trace) or method == "explain"
+    args = (expr, vars) if method == "solve" else (expr,)
+    token = _token(slot, timeout)
+    verbose = steps.verbose()
+    steps.set_verbosity(trace or stream is not None)
+    observer = contextlib.nullcontext()
+    if stream is not None:
+        observer = steps.observe(lambda step: _events.put((stream, step.toJSON())))
+    try:
+        with limits.cancellable(token), observer, steps.limit_trace(**limit):
+            res = METHODS[method](*args)
+            reply = {"result": str(res)}
+            if hasattr(res, "totex"):
+                reply["tex"] = res.totex()
+            if trace:
+                step = steps.explain(res, maxdepth=None)
+                reply["steps"] = step.toJSON() if type(step) is steps.Step else []
+    except (Exception, limits.Cancelled) as e:
+        reply = {"error": {"type": type(e).__name__, "message": str(e)}}
+    finally:
+        steps.set_verbosity(verbose)
+        if trace or stream is not None:
+            steps.step._steps.clear()
+        if stream is not None:
+            _events.put((stream, None))
+    return reply
+
+
+def call(
+    fn: Callable[..., Any],
+    args: tuple = (),
+    slot: int | None = None,
+    timeout: float | None = None,
+    verbose: bool = False,
+) -> Any:
+    """
+    Run `fn(*args)` under the request's cancel token, recording steps if
+    `verbose`. Unlike evaluate, errors are raised to the caller.
+    """
+    prev = steps.verbose()
+    steps.set_verbosity(verbose)
+    try:
+        with limits.cancellable(_token(slot, timeout)):
+            return fn(*args)
+    finally:
+        steps.set_verbosity(prev)
+        if verbose:
+            steps.step._steps.clear()
+
+
+def _token(slot: int | None, timeout: float | None) -> limits.CancelToken:
+    if slot is not None:
+        return SharedToken(slot, timeout)
+    return limits.CancelToken(timeout)
+
+
+def warm_up() -> None:
+    """Fill the caches with the values that most inputs go through"""
+    for method, expr in (
+        ("solve", "x^2 - 5x + 6 = 0"),
+        ("solve", "[x + y = 5, xy = 6]"),
+        ("solve", "2x - 3 > x/2 + 1"),
+        ("factor", "x^4 - 1"),
+        ("expand", "(x + y - 1)^3"),
+    ):
+        evaluate(method, expr)
+
+
+def initialize(flags: ctypes.Array, events: multiprocessing.Queue) -> None:
+    """Process pool initializer: attach the shared flags and queue, warm up"""
+    global _flags, _events
+    _flags, _events = flags, events
+    warm_up()
+
+
+_flags: ctypes.Array | None = None
+_events: multiprocessing.Queue | None = None
+
+__all__ = ["METHODS", "SharedToken", "evaluate", "call", "warm_up", "initialize"]
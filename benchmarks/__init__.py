@@ -0,0 +1,10 @@
+"""
+Fixed workloads over the engine's hot paths, timed at several sizes:
+
+    python -m benchmarks run -o before.json
+    python -m benchmarks run -o after.json
+    python -m benchmarks compare before.json after.json
+"""
+
+from .workloads import *
+from .runner import *
@@ -0,0 +1,45 @@
+import argparse
+import sys
+
+from .runner import compare, dump, load, run
+from .workloads import WORKLOADS
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark the algebra engine"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="run the benchmarks and write JSON results")
+    p.add_argument("patterns", nargs="*", default=["*"], help="workload name globs")
+    p.add_argument("-r", "--repeat", type=int, default=5)
+    p.add_argument("-o", "--output", help="results file (default: stdout)")
+
+    p = sub.add_parser("compare", help="compare two results files")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.add_argument("-t", "--threshold", type=float, default=0.1)
+    p.add_argument("-s", "--stat", default="min", choices=["min", "median", "mean"])
+
+    sub.add_parser("list", help="list the workloads and their sizes")
+
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        for name, w in WORKLOADS.items():
+            print(f"{name:<20} {', '.join(map(str, w.sizes))}")
+        return 0
+    if args.command == "run":
+        dump(run(args.patterns, args.repeat, verbose=True), args.output)
+        return 0
+
+    rows = compare(load(args.old), load(args.new), args.threshold, args.stat)
+    print(f"{'benchmark':<24} {'old (ms)':>10} {'new (ms)':>10} {'ratio':>7}")
+    for key, a, b, ratio, verdict in rows:
+        print(f"{key:<24} {a * 1e3:10.3f} {b * 1e3:10.3f} {ratio:7.2f} {verdict}")
+    # Non-zero exit status on regressions, for scripts
+    return int(any(verdict == "slower" for *_, verdict in rows))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
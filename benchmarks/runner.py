@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Iterable
+import fnmatch
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from utils import clear_all_caches
+from .workloads import WORKLOADS
+
+Results = dict[str, dict]
+
+
+def _commit() -> str | None:
+    try:
+        res = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return
+    return res.stdout.strip() or None
+
+
+def measure(setup, size: int, repeat: int) -> dict:
+    """
+    Time `repeat` cold runs of a workload. Caches are cleared before each
+    run, otherwise every run after the first would only time cache hits.
+    """
+    times = []
+    for _ in range(repeat):
+        clear_all_caches()
+        fn = setup(size)
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "repeat": repeat,
+    }
+
+
+def run(patterns: Iterable[str] = ("*",), repeat: int = 5, verbose=False) -> dict:
+    """
+    Run the workloads whose names match any of the glob `patterns`, at
+    each of their sizes. Results are keyed "name[size]".
+    """
+    patterns = tuple(patterns)
+    results = {}
+    for name, w in WORKLOADS.items():
+        if not any(fnmatch.fnmatch(name, p) for p in patterns):
+            continue
+        for size in w.sizes:
+            key = f"{name}[{size}]"
+            results[key] = measure(w.setup, size, repeat)
+            if verbose:
+                ms = results[key]["min"] * 1e3
+                print(f"{key:<24} {ms:10.3f} ms", file=sys.stderr)
+    return {
+        "meta": {
+            "commit": _commit(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    old: dict, new: dict, threshold: float = 0.1, stat: str = "min"
+) -> list[tuple[str, float, float, float, str]]:
+    """
+    Rows of (benchmark, old, new, new / old, verdict) for the benchmarks in
+    both runs. A ratio beyond 1 ± `threshold` is a regression or improvement.
+    """
+    rows = []
+    for key, res in old["results"].items():
+        if (other := new["results"].get(key)) is None:
+            continue
+        a, b = res[stat], other[stat]
+        ratio = b / a if a else float("inf")
+        verdict = ""
+        if ratio > 1 + threshold:
+            verdict = "slower"
+        elif ratio < 1 - threshold:
+            verdict = "faster"
+        rows.append((key, a, b, ratio, verdict))
+    return rows
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def dump(results: dict, path: str | None) -> None:
+    text = json.dumps(results, indent=2)
+    if path is None:
+        print(text)
+        return
+    with open(path, "w") as f:
+        f.write(text + "\n")
+
+
+__all__ = ["measure", "run", "compare", "load", "dump"]
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable
+import io
+import os
+import subprocess
+import sys
+
+import utils
+import utils.steps as steps
+from datatypes.expr import *
+from parsing import parser
+from solving.groebner import buchberger
+from solving.utils import get_vars
+
+x, y, z = Var("x"), Var("y"), Var("z")
+
+
+@dataclass(frozen=True, slots=True)
+class Workload:
+    """
+    A benchmark: `setup(size)` builds the inputs (untimed) and returns the
+    call to time.
+    """
+
+    name: str
+    setup: Callable[[int], Callable[[], Any]]
+    sizes: tuple[int, ...]
+
+
+WORKLOADS: dict[str, Workload] = {}
+
+
+def workload(*sizes: int):
+    def wrapper(setup: Callable[[int], Callable[[], Any]]):
+        WORKLOADS[setup.__name__] = Workload(setup.__name__, setup, sizes)
+        return setup
+
+    return wrapper
+
+
+def _linear_factors(n: int) -> str:
+    """(1x - 1)(2x + 2)(1x - 3)(2x + 4)..."""
+    return "".join(f"({1 + i % 2}x {'-+'[i % 2]} {i + 1})" for i in range(n))
+
+
+def _polynomial(n: int) -> Expr:
+    return parser.parse(_linear_factors(n), False).expand()
+
+
+def _power_sums(n: int) -> list[str]:
+    """x₁ᵏ + ... + xₙᵏ = 1 for k = 1..n: n! solutions"""
+    vars = "xyzw"[:n]
+    return [" + ".join(f"{v}^{k}" for v in vars) + " = 1" for k in range(1, n + 1)]
+
+
+@workload(10, 30, 90)
+def parse(n: int):
+    src = " + ".join(f"{i}x^{i % 7}y^{i % 3} - {i}z/{i + 1}" for i in range(1, n + 1))
+    return lambda: parser.parse(src)
+
+
+@workload(10, 100, 500)
+def add(n: int):
+    terms = [Const(i + 1) * Var(f"a{i % 25}") ** (i // 25 + 1) for i in range(n)]
+    return lambda: Add(*terms)
+
+
+@workload(10, 100, 500)
+def mul(n: int):
+    factors = [Var(f"a{i % 25}") ** Const(i // 25 + 1) for i in range(n)]
+    return lambda: Mul(*factors)
+
+
+@workload(4, 8, 12)
+def expand(n: int):
+    node = (x + 2 * y - z + 1) ** n
+    return node.expand
+
+
+@workload(3, 6, 9)
+def factor(n: int):
+    node = _polynomial(n)
+    return lambda: utils.factor(node)
+
+
+@workload(5, 10, 20)
+def poly_gcd(n: int):
+    g = _polynomial(n // 2)
+    a = utils.extract((g * _polynomial(n - n // 2)).expand(), x)
+    b = utils.extract((g * (x**n + 5)).expand(), x)
+    return lambda: utils.poly_gcd(a, b)
+
+
+@workload(3, 6, 9)
+def rational_roots(n: int):
+    coeffs = utils.extract(_polynomial(n), x)
+    return lambda: utils.rational_roots(coeffs)
+
+
+@workload(2, 3)
+def groebner(n: int):
+    eqns = parser.parse("[" + ", ".join(_power_sums(n)) + "]", False)
+    polys = [(i.left - i.right).expand() for i in eqns]
+    vars = sorted(get_vars(eqns), reverse=True)
+    return lambda: buchberger(polys, vars)
+
+
+@workload(3, 6, 12)
+def solve_linear(n: int):
+    # Diagonally dominant, so always uniquely solvable
+    vars = [Var(v) for v in "abcdfghjkmnp"[:n]]
+    rows = (
+        " + ".join(
+            f"{(i * j) % 7 + 1 + (i == j) * 7 * n}{v}" for j, v in enumerate(vars)
+        )
+        + f" = {i}"
+        for i in range(n)
+    )
+    eqns = parser.parse("[" + ", ".join(rows) + "]", False)
+    return lambda: eqns.solve_for(vars)
+
+
+@workload(2, 3)
+def solve_system(n: int):
+    src = "[" + ", ".join(_power_sums(n)) + "]"
+    return lambda: parser.parse(src)
+
+
+@workload(3, 5, 8)
+def solve_inequality(n: int):
+    src = _linear_factors(n) + " > 0"
+    return lambda: parser.parse(src)
+
+
+@workload(1, 2, 3)
+def render_steps(n: int):
+    from rich.console import Console
+
+    src = ["3(x - 2) + 5 = 2x/3", "x^2 - 5x + 6 = 0", "[x + y = 5, xy = 6]"][n - 1]
+
+    def run():
+        steps.set_verbosity(True)
+        try:
+            step = steps.explain(parser.parse(src))
+            Console(file=io.StringIO(), width=100).print(step)
+            return step.totex()
+        finally:
+            steps.set_verbosity(False)
+
+    return run
+
+
+@workload(1, 2, 3)
+def cold_import(n: int):
+    # A fresh interpreter each run: startup plus imports, as a worker pays
+    module = ["datatypes", "solving", "parsing"][n - 1]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    cmd = [sys.executable, "-c", f"import {module}"]
+    return lambda: subprocess.run(cmd, cwd=root, check=True)
+
+
+__all__ = ["Workload", "WORKLOADS", "workload"]
@@ -7,6 +7,8 @@ import itertools
 from collections import defaultdict
 
 from utils import steps
+from utils import profile
+from utils import limits
 
 from .base import Expr, Collection
 from . import expr
@@ -78,6 +80,7 @@ class Add(Collection):
             return expr.Mul(k, v)
 
         def calculate(den, n, d):
+            limits.checkpoint("add.rationalize")
             return den.divide(d).multiply(n)
             if den.__class__ is expr.Add and all(
                 map(utils.is_polynomial, (den, n, d))
@@ -161,12 +164,41 @@ class Add(Collection):
             return self
         if b == 0:
             return b
+        limits.checkpoint("add.multiply")
+        # Per-term products are only worth recording in explanations
+        if not steps.verbose() and (res := utils.sparse_multiply(self, b)) is not None:
+            return res
         if b.__class__ is expr.Add:
             return Add.from_terms(i * j for i in self for j in b)
         return Add.from_terms(i * b for i in self)
 
     multiply.check_changed(Expr.__mul__._is_simplified)
 
+    @steps.tracked("POW", label="Expand")
+    def power(self, n: int) -> Expr:
+        """Expand self^n using the multinomial theorem"""
+        if any(
+            i.__class__ is expr.Pow and i.base.__class__ is Add
+            for t in self
+            for i in expr.Mul.flatten(t, 0)
+        ):
+            # Powers of radicals like √(x + 1) collapse into sums to distribute
+            return reduce(Expr.multiply, itertools.repeat(self, n))
+        pows = [
+            list(itertools.accumulate(itertools.repeat(t, n - 1), expr.Mul, initial=t))
+            for t in self
+        ]
+
+        def terms():
+            for exps, c in utils.multinomial(n, len(self.args)):
+                limits.checkpoint("add.power")
+                yield expr.Mul.from_terms(
+                    (expr.Const(c), *(pows[i][e - 1] for i, e in enumerate(exps) if e))
+                )
+
+        return Add.from_terms(terms())
+
+    @utils.lru_cache
     def totex(self):
         res = ""
         for term in self:
@@ -181,4 +213,6 @@ class Add(Collection):
         return res
 
 
+profile.instrument(Add, "merge", "Add.merge")
+
 __all__ = ["Add"]
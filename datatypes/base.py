@@ -8,6 +8,8 @@ from functools import partial, reduce
 import operator
 import utils
 from utils import steps
+from utils import limits
+from utils import profile
 
 from . import expr
 
@@ -16,6 +18,7 @@ from typing import TYPE_CHECKING, Generator, Iterable
 
 if TYPE_CHECKING:
     from .const import Const, Float
+    from .var import Var
 
 
 class Expr:
@@ -138,6 +141,9 @@ class Expr:
     def subs(self, mapping: dict[Expr]) -> Expr:
         if isinstance(self, expr.Number):
             return self
+        # Without steps to record, share the work across calls with one mapping
+        if not steps.verbose() and all(k.__class__ is expr.Var for k in mapping):
+            return _subs(self, frozenset(mapping.items()))
         if (v := mapping.get(self, None)) is not None:
             return v
         if type(self) is expr.Var:
@@ -168,14 +174,40 @@ class Expr:
         return str(self)
 
 
+@utils.lru_cache
+def _subs(node: Expr, mapping: frozenset[tuple[Var, Expr]]) -> Expr:
+    """
+    Substitute variables, leaving alone the subtrees without any of them.
+    A changed Add or Mul is rebuilt by a single merge of its new terms.
+    """
+    if node.__class__ is expr.Var:
+        return next((v for k, v in mapping if k == node), node)
+    if utils.free_vars(node).isdisjoint(k for k, _ in mapping):
+        return node
+    if node.__class__ is expr.Pow:
+        return _subs(node.base, mapping) ** _subs(node.exp, mapping)
+    args = [_subs(i, mapping) for i in node.args]
+    if all(i is j for i, j in zip(args, node.args)):
+        return node
+    return node.__class__(*args)
+
+
+@utils.lru_cache
+def _new_collection(cls, *args: Expr, **kwargs) -> Expr:
+    return cls.from_terms(args, **kwargs)
+
+
 @dataclass(frozen=True, init=False)
 class Collection(ABC, Expr):
     args: tuple[Expr]
     __slots__ = ("args", "_hash")
 
-    @utils.lru_cache
     def __new__(cls, *args: Expr, **kwargs) -> Expr:
-        return cls.from_terms(args, **kwargs)
+        obj = _new_collection(cls, *args, **kwargs)
+        # Cached nodes skip from_terms, and with it the budget check
+        if obj.__class__ is cls:
+            limits.check_size(obj)
+        return obj
 
     if TYPE_CHECKING:
 
@@ -184,6 +216,10 @@ class Collection(ABC, Expr):
     def __hash__(self) -> int:
         return self._hash
 
+    def __reduce__(self):
+        # Hashes of Var depend on the interpreter's hash seed: rebuild, don't copy
+        return self.from_terms, (self.args, False)
+
     def __iter__(self):
         return iter(self.args)
 
@@ -207,6 +243,7 @@ class Collection(ABC, Expr):
         obj = super(Collection, cls).__new__(cls)
         object.__setattr__(obj, "args", tuple(args))
         object.__setattr__(obj, "_hash", hash((cls, obj.args)))
+        limits.check_size(obj)
         return obj
 
     @classmethod
@@ -238,4 +275,6 @@ class Collection(ABC, Expr):
         )
 
 
+profile.instrument(Collection, "from_terms")
+
 __all__ = ["Expr", "Collection"]
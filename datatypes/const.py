@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 import functools
 import utils
+from utils import profile
 import sys
 import math
 
@@ -77,6 +78,9 @@ class Complex:
     def __delattr__(self, name):
         raise FrozenInstanceError(f"cannot delete field '{name}'")
 
+    def __reduce__(self):
+        return Complex, (self.real, self.imag)
+
     def __repr__(self) -> str:
         r = str(self.real)
         i = str(self.imag) + "i"
@@ -208,6 +212,9 @@ class Const(Number):
     def __hash__(self) -> int:
         return _hash_algorithm(self.numerator, self.denominator)
 
+    def __reduce__(self):
+        return Const, (self.numerator, self.denominator)
+
     def __float__(self) -> float:
         return self.numerator / self.denominator
 
@@ -356,6 +363,9 @@ class Float(Number):
     def __hash__(self) -> int:
         return hash(self._val)
 
+    def __reduce__(self):
+        return Float, (self._val,)
+
     def __abs__(self) -> Float:
         return Float(abs(self._val))
 
@@ -431,4 +441,6 @@ class Float(Number):
         return str(self).replace("i", "\\mathrm{i}")
 
 
+profile.instrument(Const, "__new__", "Const.__new__")
+
 __all__ = ["Complex", "Const", "Float"]
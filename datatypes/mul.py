@@ -10,6 +10,7 @@ from functools import reduce
 from collections import defaultdict
 
 import utils
+from utils import profile
 
 
 def form(k, v):
@@ -124,6 +125,7 @@ class Mul(Collection):
             return num
         return "/".join((num, den))
 
+    @utils.lru_cache
     def as_ratio(self) -> tuple[Expr]:
         return tuple(
             map(
@@ -177,6 +179,7 @@ class Mul(Collection):
             return self.args
         return self.args[0], Mul.from_terms(self.args[1:], 0)
 
+    @utils.lru_cache
     def totex(self) -> str:
         num, den = self.as_ratio()
         if num.__class__ is Mul:
@@ -202,4 +205,6 @@ class Mul(Collection):
         return f'\\frac{num.join("{}")}{den.join("{}")}'
 
 
+profile.instrument(Mul, "merge", "Mul.merge")
+
 __all__ = ["Mul"]
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-import itertools
-import functools
+import math
 from typing import TYPE_CHECKING
 
 import utils
+from utils import limits
 
 from . import expr
 from .base import Collection, Expr
@@ -37,6 +37,7 @@ class Pow(Expr):
                 if base.__class__ is expr.Float:
                     return base.pow(exp)
                 if exp.denominator == 1:
+                    limits.check_power(base, exp.numerator)
                     return base.pow(exp.numerator)
                 c, base, exp = utils.simplify_radical(
                     base.pow(exp.numerator), exp.denominator
@@ -58,6 +59,10 @@ class Pow(Expr):
         def __init__(self, base: Expr, exp: Expr) -> None:
             pass
 
+    def __reduce__(self):
+        return _restore, (self.base, self.exp)
+
+    @utils.lru_cache
     def __repr__(self) -> str:
         base = str(self.base)
         if (
@@ -102,9 +107,15 @@ class Pow(Expr):
             and not exp.numerator.imag
             and exp.numerator > 1
         ):
-            base = functools.reduce(
-                Expr.multiply, itertools.repeat(base, exp.numerator)
-            )
+            # Number of terms of the multinomial expansion: exact only when
+            # no two terms share a variable. Otherwise like terms merge, and
+            # the merged result is checked as it is built
+            free = [utils.free_vars(i) for i in base.args]
+            if sum(map(len, free)) == len(frozenset().union(*free)):
+                limits.check_terms(
+                    math.comb(exp.numerator + len(base.args) - 1, exp.numerator)
+                )
+            base = base.power(exp.numerator)
             if exp.denominator == 1:
                 return base
             exp = expr.Const(1, exp.denominator)
@@ -123,6 +134,7 @@ class Pow(Expr):
             return -abs(v) ** e
         return v**e
 
+    @utils.lru_cache
     def totex(self) -> str:
         from .mul import _tex
 
@@ -140,4 +152,12 @@ class Pow(Expr):
         return f"\\sqrt[{r}]{base}"
 
 
+def _restore(base: Expr, exp: Expr) -> Pow:
+    # Already simplified: skip Pow.__new__ when unpickling
+    self = object.__new__(Pow)
+    object.__setattr__(self, "base", base)
+    object.__setattr__(self, "exp", exp)
+    return self
+
+
 __all__ = ["Pow"]
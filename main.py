@@ -1,14 +1,22 @@
+from api import Pool
 from parsing import parser
 from parsing.lexer import FUNCTIONS
 from utils import steps
+from utils import limits
 
+from concurrent.futures import Future
+import asyncio
+import multiprocessing
 import re
+import time
+import weakref
 
 from rich.text import Text
 from rich.panel import Panel
 from rich.console import Group
 from rich.padding import Padding
 from textual import on, work
+from textual.markup import escape
 from textual.widgets import Input, Header, Footer, Static, Collapsible
 from textual.containers import VerticalScroll
 from textual.app import App
@@ -16,6 +24,41 @@ from textual.validation import Validator
 from rich.highlighter import ReprHighlighter
 
 
+class LazyCollapsible(Collapsible):
+    """Collapsible whose contents are only built once it is first expanded"""
+
+    _build = None
+
+    def __init__(self, build, **kwargs):
+        super().__init__(**kwargs)
+        self._build = build
+
+    def compose(self):
+        if not self.collapsed and self._build is not None:
+            self._contents_list.extend(self._build())
+            self._build = None
+        yield from super().compose()
+
+    def _watch_collapsed(self, collapsed: bool) -> None:
+        if not collapsed and self._build is not None and self.is_mounted:
+            self.query_one(Collapsible.Contents).mount_all(self._build())
+            self._build = None
+        super()._watch_collapsed(collapsed)
+
+
+def renderable(step: steps.Step):
+    """The rich renderable of a step, cached while the step is alive"""
+    if (hit := _renderables.get(id(step))) is not None and hit[0]() is step:
+        return hit[1]
+    res = step.__rich__()
+    key = id(step)
+    _renderables[key] = (
+        weakref.ref(step, lambda _: _renderables.pop(key, None)),
+        res,
+    )
+    return res
+
+
 def determine(val):
     if isinstance(val, Panel):
         res = determine(val.renderable)
@@ -28,10 +71,10 @@ def determine(val):
             title = Text.from_markup(val.renderables[0])
             highlighter.highlight(title)
             if isinstance(val.renderables[1], Padding):
-                vals = val.renderables[1:]
-                vals = vals[0].renderable.renderables + vals[1:]
-                res = Collapsible(
-                    *(determine(v) for v in vals),
+                # Rendering the children is left for when they are shown
+                body, *final = val.renderables[1:]
+                res = LazyCollapsible(
+                    lambda: [determine(v) for v in body.renderable.renderables + final],
                     title=title,
                     collapsed=val.collapsed,
                 )
@@ -41,23 +84,24 @@ def determine(val):
                 if val.collapsed:
                     res.title = res.compact
                 return res
-            return Collapsible(
-                *(determine(v) for v in val.renderables[1:]),
+            return LazyCollapsible(
+                lambda: [determine(v) for v in val.renderables[1:]],
                 title=title,
                 collapsed=False,
             )
 
-        return Collapsible(
-            *(determine(v) for v in val.renderables), title="", collapsed=False
+        return LazyCollapsible(
+            lambda: [determine(v) for v in val.renderables], title="", collapsed=False
         )
     if isinstance(val, steps.step.Step):
-        return determine(val.__rich__())
+        return determine(renderable(val))
     text = Text.from_markup(str(val))
     highlighter.highlight(text)
     return Static(text)
 
 
 highlighter = ReprHighlighter()
+_renderables: dict[int, tuple[weakref.ref, object]] = {}
 
 
 from textual.app import App, ComposeResult
@@ -65,6 +109,19 @@ from textual.widgets import Input
 from textual.suggester import Suggester
 
 
+def simplify(expr: str) -> str:
+    """Live preview of an input, without solving it"""
+    return str(parser.parse(expr, False))
+
+
+def explain(expr: str):
+    """Evaluate an input in a worker process: the explained result or error"""
+    try:
+        return steps.explain(parser.parse(expr))
+    except Exception as e:
+        return steps.explain(e, maxdepth=None)
+
+
 class ExprSuggester(Suggester):
     async def get_suggestion(self, value: str):
         if not value:
@@ -98,7 +155,17 @@ class ExprValidator(Validator):
 
 
 class AlgebraEngine(App):
-    BINDINGS = [("shift+delete", "clear_history", "Clear History")]
+    # Older entries are dropped past this many, to keep the DOM small
+    MAX_HISTORY = 100
+    # Seconds of typing inactivity before previewing, and the preview budget
+    PREVIEW_DELAY = 0.25
+    PREVIEW_TIMEOUT = 2.0
+    BINDINGS = [
+        ("shift+delete", "clear_history", "Clear History"),
+        ("escape", "cancel", "Cancel"),
+    ]
+    pool: Pool | None = None
+    pending: Future | None = None
 
     def compose(self) -> ComposeResult:
         with Header():
@@ -116,19 +183,82 @@ class AlgebraEngine(App):
                 suggester=ExprSuggester(),
                 validate_on=["submitted"],
             ),
+            Static(id="preview"),
+            Static(id="status"),
         )
         yield Footer()
 
     def on_mount(self):
+        # Warm worker processes, for evaluating and for previews: solving
+        # never blocks the interface
+        self.pool = Pool(2)
         self.query_one(Input).focus()
 
-    @work(thread=True)
-    def evaluate(self, expr: str):
+    def on_unmount(self):
+        self.action_cancel()
+        self.pool.close()
+
+    @work(exclusive=True, group="evaluate")
+    async def evaluate(self, expr: str):
+        """Evaluate in the worker process. A new submission cancels this one"""
+        status = self.query_one("#status", Static)
+        start = time.perf_counter()
+        timer = self.set_interval(
+            0.1,
+            lambda: status.update(
+                f"[dim]Evaluating {escape(expr)} ({time.perf_counter() - start:.1f}s),"
+                " press Esc to cancel[/dim]"
+            ),
+        )
+        self.pending = fut = self.pool.call(explain, expr, verbose=True)
+        try:
+            res = await asyncio.wrap_future(fut)
+        except asyncio.CancelledError:
+            self.pool.cancel(fut)
+            raise
+        except (limits.Cancelled, Exception) as e:
+            res = f"[bold red]{type(e).__name__}:[/bold red] {e}"
+        finally:
+            timer.stop()
+            status.update("")
+            if self.pending is fut:
+                self.pending = None
+        self.add_step(res, expr)
+
+    @work(exclusive=True, group="preview")
+    async def preview(self, expr: str):
+        """Show the simplified input once typing pauses"""
+        # A new edit cancels this worker while it waits: that's the debounce
+        await asyncio.sleep(self.PREVIEW_DELAY)
+        preview = self.query_one("#preview", Static)
+        if not expr.strip():
+            preview.update("")
+            return
         try:
-            res = parser.parse(expr)
-            self.call_from_thread(self.add_step, steps.explain(res), expr)
+            parser.AST(expr)
         except Exception as e:
-            self.call_from_thread(self.add_step, steps.explain(e, maxdepth=None), expr)
+            preview.update(f"[dim red]{type(e).__name__}: {escape(str(e))}[/dim red]")
+            return
+        fut = self.pool.call(simplify, expr, timeout=self.PREVIEW_TIMEOUT)
+        try:
+            res = await asyncio.wrap_future(fut)
+        except asyncio.CancelledError:
+            self.pool.cancel(fut)
+            raise
+        except (limits.Cancelled, Exception):
+            preview.update("")
+            return
+        text = Text.from_ansi("= " + res, style="dim")
+        highlighter.highlight(text)
+        preview.update(text)
+
+    @on(Input.Changed, "#input")
+    def on_input_changed(self, event: Input.Changed):
+        self.preview(event.value)
+
+    def action_cancel(self):
+        if self.pending is not None:
+            self.pool.cancel(self.pending)
 
     def action_clear_history(self):
         self.query_one("#history", VerticalScroll).remove_children()
@@ -144,11 +274,13 @@ class AlgebraEngine(App):
             )
             return
         event.input.tooltip = None
-        self.evaluate(event.value).run()
+        self.evaluate(event.value)
 
     def add_step(self, step, input: str):
         history = self.query_one("#history", VerticalScroll)
         history.mount(determine(step))
+        if (n := len(history.children) - self.MAX_HISTORY) > 0:
+            history.remove_children(history.children[:n])
 
         history.scroll_end()
 
@@ -166,6 +298,8 @@ class AlgebraEngine(App):
 
 
 if __name__ == "__main__":
+    # The pool's worker processes must not start the app again
+    multiprocessing.freeze_support()
     steps.set_verbosity(True)
     ae = AlgebraEngine()
     ae.run()
@@ -1,10 +1,15 @@
-from pylatexenc.latexwalker import *
-
-
 from fractions import Fraction
-from typing import Generator
+from typing import Generator, Iterable
+import re
+
 from parsing.tokens import Token, TokenType, FUNCTIONS
 from datatypes.expr import Const, Var
+import utils
+
+# Characters that make an input LaTeX rather than plain text
+LATEX = frozenset("\\{}$%&#_'`")
+# Single character tokens (and spaces): never part of a longer lexeme
+DELIMITERS = re.compile(r"([\s,=<>≥≤+\-*/^~()\[\]])")
 
 
 class Lexer:
@@ -110,6 +115,23 @@ class Lexer:
             self.advance()
 
     def tokenize(self) -> Generator[Token, None, None]:
+        if LATEX.isdisjoint(self.expr):
+            # Plain text: lex piece by piece, so an edit only relexes its piece
+            return self.insert_operators(
+                tk for i in DELIMITERS.split(self.expr) if i for tk in lex_piece(i)
+            )
+        return self.insert_operators(self.latex_tokens())
+
+    def latex_tokens(self) -> Generator[Token, None, None]:
+        from pylatexenc.latexwalker import (
+            LatexCharsNode,
+            LatexGroupNode,
+            LatexMacroNode,
+            LatexMathNode,
+            LatexSpecialsNode,
+            LatexWalker,
+        )
+
         def dfs(node):
             if node is None:
                 yield Token(TokenType.NaN)
@@ -162,44 +184,55 @@ class Lexer:
                     SyntaxError(f"unexpected latex node: {node.__class__.__name__}"),
                 )
 
+        for i in LatexWalker(self.expr).get_latex_nodes()[0]:
+            yield from dfs(i)
+
+    @staticmethod
+    def insert_operators(tokens: Iterable[Token]) -> Generator[Token, None, None]:
+        """Make implicit multiplication explicit and tell binary +/- from unary"""
         was_num = 0
         num_dict = {TokenType.CONST: 3, TokenType.VAR: 2, TokenType.RPAREN: 1}
-        for i in LatexWalker(self.expr).get_latex_nodes()[0]:
-            for j in dfs(i):
-                if j.type is TokenType.ERROR:
-                    yield j
-                    return
-                if was_num:
-                    if j.type is TokenType.POS:
-                        was_num = 0
-                        yield Token(TokenType.ADD)
-                        continue
-                    if j.type is TokenType.NEG:
-                        was_num = 0
-                        yield Token(TokenType.SUB)
-                        continue
-                    if j.type in (
-                        TokenType.LPAREN,
-                        TokenType.CONST,
-                        TokenType.VAR,
-                    ):
-                        if (
-                            j.type is TokenType.CONST
-                            and not j.value.numerator.imag
-                            and was_num > 1
-                        ):
-                            yield Token(
-                                TokenType.ERROR,
-                                SyntaxError(
-                                    "no operator between numbers"
-                                    if was_num == 3
-                                    else "variable preceeding digit"
-                                ),
-                            )
-                            return
-                        was_num = 0
-                        yield Token(TokenType.MUL, iscoef=j.type is TokenType.VAR)
-                    if j.type.name in FUNCTIONS:
-                        yield Token(TokenType.MUL)
+        for j in tokens:
+            if j.type is TokenType.ERROR:
                 yield j
-                was_num = num_dict.get(j.type, 0)
+                return
+            if was_num:
+                if j.type is TokenType.POS:
+                    was_num = 0
+                    yield Token(TokenType.ADD)
+                    continue
+                if j.type is TokenType.NEG:
+                    was_num = 0
+                    yield Token(TokenType.SUB)
+                    continue
+                if j.type in (
+                    TokenType.LPAREN,
+                    TokenType.CONST,
+                    TokenType.VAR,
+                ):
+                    if (
+                        j.type is TokenType.CONST
+                        and not j.value.numerator.imag
+                        and was_num > 1
+                    ):
+                        yield Token(
+                            TokenType.ERROR,
+                            SyntaxError(
+                                "no operator between numbers"
+                                if was_num == 3
+                                else "variable preceeding digit"
+                            ),
+                        )
+                        return
+                    was_num = 0
+                    yield Token(TokenType.MUL, iscoef=j.type is TokenType.VAR)
+                if j.type.name in FUNCTIONS:
+                    yield Token(TokenType.MUL)
+            yield j
+            was_num = num_dict.get(j.type, 0)
+
+
+@utils.lru_cache
+def lex_piece(piece: str) -> tuple[Token, ...]:
+    """Raw tokens of a plain text piece between delimiters"""
+    return tuple(Lexer(piece).generate_tokens())
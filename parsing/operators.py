@@ -79,7 +79,7 @@ def subs(a: Expr, *eqns: Equation) -> Expr:
     return a.subs(dict((eqn.left, eqn.right) for eqn in eqns))
 
 
-def approx(a: Expr) -> Float:
+def approx(a: Expr | System) -> Float:
     return a.approx()
 
 
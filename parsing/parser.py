@@ -9,6 +9,7 @@ from parsing import operators
 from .tokens import FUNCTIONS, Token, TokenType
 from .lexer import Lexer
 from utils.constants import SYMBOLS
+import utils
 
 
 class Function:
@@ -291,5 +292,7 @@ def parse(expr: str, autosolve: bool = True) -> Expr:
     return Parser(Lexer(expr).tokenize()).parse(autosolve)
 
 
+@utils.lru_cache
 def AST(expr: str):
+    """Syntax tree of an input, cached: validation reparses on every edit"""
     return Parser(Lexer(expr).tokenize())._parse()
@@ -13,6 +13,7 @@ from datatypes.base import Collection, Expr
 from datatypes.expr import *
 from utils.steps import Step
 import utils.steps as steps
+import utils.limits as limits
 
 import utils
 from .utils import nth_roots, roots, eliminate_radicals
@@ -35,6 +36,7 @@ def simple_isolate_radical(comp, value):
 
     idx = 0
     while True:
+        limits.checkpoint("comparison.isolate_radical")
         col()
         if not rad:
             break
@@ -82,20 +84,6 @@ class Comparison:
     right: Expr
     rel: CompRel = CompRel.EQ
 
-    def __post_init__(self):
-        if steps.verbose() or id(self) in steps.step._steps:
-            return
-        steps.register(
-            Step(
-                self.rel.name,
-                (self.left, self.right),
-                self,
-                reason="Simplify",
-                changed=False,
-            ),
-            False,
-        )
-
     def __repr__(self) -> str:
         return "{0} {2} {1}".format(self.left, self.right, self.rel)
 
@@ -114,6 +102,7 @@ class Comparison:
     def solve_for(self, value: Var) -> Comparison:
         org = self
         while True:
+            limits.checkpoint("comparison.solve_for")
             # If input expression was simplified, double steps.register
             # if self is not org:
             steps.register(self)
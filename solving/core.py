@@ -7,8 +7,10 @@ from itertools import product
 from datatypes.base import Expr
 from datatypes.const import Const
 import utils.steps as steps
+import utils.limits as limits
 from utils.steps import Step
 from .utils import domain_restriction, get_vars
+from .isolation import polynomial_roots
 
 from .interval import Interval, INF
 from .solutions import IntervalUnion, SolutionSet
@@ -97,10 +99,12 @@ def test_intervals(
     org: Comparison,
     var: Var,
     verbose: bool = True,
+    exact: bool = False,
 ):
     valid = []
     with steps.scoped(inner := []):
         for interval in intervals:
+            limits.checkpoint("core.test_intervals")
             a, b = interval.start, interval.end
             if a is b is None:
                 a = Const(random.randrange(-100, 100))
@@ -113,15 +117,20 @@ def test_intervals(
             if b - a >= 2:
                 test_val = Const(random.randrange(int(a) + 1, int(b)))
             else:
-                test_val = Float(
-                    random.uniform(a if not interval.open[0] else a + (b - a) * 0.1, b)
+                test_val = random.uniform(
+                    a if not interval.open[0] else a + (b - a) * 0.1, b
                 )
+                # Exact arithmetic keeps the sign right next to clustered roots
+                if exact:
+                    test_val = Const(*test_val.as_integer_ratio())
+                else:
+                    test_val = Float(test_val)
             try:
                 if res := org.subs({var: test_val}).is_close():
                     valid.append(interval)
                 if verbose:
                     steps.register(res, reason=f"Testing {interval}")
-            except:
+            except Exception:
                 continue
     valid = merge_intervals(valid)
     if not valid:
@@ -148,6 +157,7 @@ def interpolate_roots(
     roots: Iterable[Expr],
     domain: Interval | IntervalUnion,
     verbose=True,
+    exact=False,
 ):
 
     open = org.rel.name == "NE" or not org.rel.name.endswith("E")
@@ -162,7 +172,7 @@ def interpolate_roots(
     else:
         intervals = split_domain_by_roots(domain, roots, open)
     # Try testing points
-    return test_intervals(intervals, org, var, verbose)
+    return test_intervals(intervals, org, var, verbose, exact)
 
 
 def intersect_domains(domains: Iterable[Iterable[Interval]]) -> list[Interval]:
@@ -226,7 +236,7 @@ def validate_solution(
                 if not (v := v.is_close()):
                     res = False
                 steps.register(v)
-        except:
+        except Exception:
             # raise
             res = False
     if verbose:
@@ -239,6 +249,7 @@ def verify_systems(
 ) -> set[Comparison]:
     res = set()
     for i in solutions:
+        limits.checkpoint("core.verify_systems")
         d = {j.left: j.right for j in i if j.left in vars}
         if validate_solution(org, i, d):
             res.add(tuple(map(d.get, vars)))
@@ -271,9 +282,32 @@ def solve_ineq(var, ineq: Comparison):
             roots = [res.right]
     else:
         roots = [i.right for i in res]
+    # Numeric roots of close or clustered roots can merge or swap,
+    # split on certified isolating intervals instead
+    certified = polynomial_roots(ineq.left - ineq.right, var)
+    if certified is not None and any(i.__class__ is Float for i in roots):
+        roots = certify_roots(roots, certified)
 
     # Third split domain by roots
-    return Comparison(var, interpolate_roots(var, ineq, roots, domain), CompRel.IN)
+    res = interpolate_roots(var, ineq, roots, domain, exact=certified is not None)
+    return Comparison(var, res, CompRel.IN)
+
+
+def certify_roots(roots: list[Expr], certified: list[tuple[tuple, Expr]]) -> list[Expr]:
+    """
+    Replace the numeric roots with the certified root of the isolating
+    interval they fall in, keeping the exact roots. Certified roots that
+    the solver missed are added.
+    """
+    res = [i for i in roots if i.__class__ is not Float]
+    for (a, b), root in certified:
+        if not any(
+            i == root if a == b else a <= i.approx() <= b
+            for i in res
+            if not i.approx().imag
+        ):
+            res.append(root)
+    return res
 
 
 @steps.tracked("solve")
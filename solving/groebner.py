@@ -5,6 +5,7 @@ from datatypes.base import Expr
 
 from datatypes import *
 import utils
+import utils.limits as limits
 
 
 def leading(f: Add, vars):
@@ -40,6 +41,7 @@ def reduce(f, G, vars):
 
     r = f
     while r:
+        limits.checkpoint("groebner.reduce")
         divided = False
         for g in G:
             # Try single division step
@@ -53,12 +55,14 @@ def reduce(f, G, vars):
     return r.as_ratio()[0]
 
 
+@utils.persistent("groebner")
 def buchberger(G: list[Add], vars: list[Var]) -> list[Add | Expr]:
     # print(G)
     G = [g.expand().as_ratio()[0] for g in G]  # G.copy()
     pairs = list(itertools.combinations(G, 2))
     # idx = 1
     while pairs:
+        limits.checkpoint("groebner.pair")
         f, g = pairs.pop(0)
         # idx += 1
         if utils.get_vars(f).isdisjoint(utils.get_vars(g)):
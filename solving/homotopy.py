@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from itertools import product
+from typing import Iterable, Sequence, TYPE_CHECKING
+import cmath
+import math
+
+import utils
+import utils.limits as limits
+from datatypes.expr import Var
+
+from .utils import simplify_complex
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .comparison import Comparison
+
+
+class PolySystem:
+    """
+    A square polynomial system compiled to arrays: every monomial of every
+    equation is a row of exponents, evaluated for many points at once.
+    """
+
+    __slots__ = ("exps", "coefs", "jac_exps", "jac_coefs", "degrees")
+
+    def __init__(self, polys: Sequence[dict[tuple[int, ...], complex]], n: int):
+        import numpy as np
+
+        monos = sorted({e for p in polys for e in p})
+        index = {e: i for i, e in enumerate(monos)}
+        self.exps = np.array(monos, dtype=float).reshape(len(monos), n)
+        self.coefs = np.zeros((len(polys), len(monos)), dtype=complex)
+        for i, p in enumerate(polys):
+            for e, c in p.items():
+                self.coefs[i, index[e]] = c
+        # ∂/∂xⱼ of xᵉ is eⱼ·x^(e - δⱼ)
+        eye = np.eye(n)
+        self.jac_exps = np.maximum(self.exps[None] - eye[:, None], 0)
+        self.jac_coefs = self.coefs[None] * self.exps.T[:, None]
+        self.degrees = [max(sum(e) for e in p) for p in polys]
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """Values at each row of `x`"""
+        import numpy as np
+
+        monos = np.prod(x[:, None] ** self.exps[None], axis=2)
+        return monos @ self.coefs.T
+
+    def jacobian(self, x: np.ndarray) -> np.ndarray:
+        import numpy as np
+
+        monos = np.prod(x[:, None, None] ** self.jac_exps[None], axis=3)
+        return np.einsum("jik,pjk->pij", self.jac_coefs, monos)
+
+
+def compile_system(
+    eqns: Iterable[Comparison], vars: Sequence[Var]
+) -> PolySystem | None:
+    """
+    Compile polynomial equations in `vars` with numeric coefficients.
+    Returns None for anything else, or when the system is not square.
+    """
+    eqns = list(eqns)
+    if len(eqns) != len(vars):
+        return
+    exprs = [eqn.normalize().left.as_ratio()[0].expand() for eqn in eqns]
+    if (res := utils.to_sparse(*exprs)) is None:
+        return
+    gens, polys = res
+    if not set(gens) <= set(vars):
+        return
+    cols = [gens.index(v) if v in gens else None for v in vars]
+    polys = [
+        {
+            tuple(e[i] if i is not None else 0 for i in cols): complex(c.approx())
+            for e, c in p.items()
+        }
+        for p in polys
+    ]
+    if any(not p for p in polys):
+        return
+    return PolySystem(polys, len(vars))
+
+
+def track(
+    f: PolySystem,
+    tol: float = 1e-10,
+    maxsteps: int = 2000,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Track every path of the total-degree homotopy
+        H(x, t) = (1 - t)·γ·G(x) + t·F(x),  G(x) = xᵢ^dᵢ - 1
+    from the roots of unity at t = 0 to t = 1, all paths at once. Each step
+    is an RK4 predictor along dx/dt = -Hₓ⁻¹·Hₜ followed by Newton
+    correction, with a step size adapted per path. Paths that diverge
+    (solutions at infinity) or fail to converge are dropped.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    gamma = cmath.exp(2j * math.pi * rng.random())
+    d = np.array(f.degrees)
+    n = len(d)
+    x = np.array(
+        [
+            [cmath.exp(2j * math.pi * k / di) for k, di in zip(ks, d)]
+            for ks in product(*map(range, d))
+        ]
+    )
+    p = len(x)
+
+    def G(x):
+        return gamma * (x**d - 1)
+
+    def JG(x):
+        return gamma * (np.eye(n)[None] * (d * x ** (d - 1))[:, None])
+
+    def H(x, t):
+        return (1 - t)[:, None] * G(x) + t[:, None] * f(x)
+
+    def Hx(x, t):
+        return (1 - t)[:, None, None] * JG(x) + t[:, None, None] * f.jacobian(x)
+
+    def dx(x, t):
+        ht = f(x) - G(x)
+        return -np.linalg.solve(Hx(x, t), ht[..., None])[..., 0]
+
+    t = np.zeros(p)
+    h = np.full(p, 0.05)
+    active = np.ones(p, dtype=bool)
+    with np.errstate(all="ignore"):
+        for _ in range(maxsteps):
+            limits.checkpoint("homotopy.track")
+            if not active.any():
+                break
+            i = np.flatnonzero(active)
+            xi, ti = x[i], t[i]
+            hi = np.minimum(h[i], 1 - ti)
+            try:
+                k1 = dx(xi, ti)
+                k2 = dx(xi + hi[:, None] / 2 * k1, ti + hi / 2)
+                k3 = dx(xi + hi[:, None] / 2 * k2, ti + hi / 2)
+                k4 = dx(xi + hi[:, None] * k3, ti + hi)
+            except np.linalg.LinAlgError:
+                k1 = k2 = k3 = k4 = np.full_like(xi, np.nan)
+            y = xi + hi[:, None] / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            tn = ti + hi
+            ok = np.isfinite(y).all(axis=1)
+            for _ in range(3):
+                try:
+                    step = np.linalg.solve(Hx(y, tn), H(y, tn)[..., None])[..., 0]
+                except np.linalg.LinAlgError:
+                    ok[:] = False
+                    break
+                y = y - step
+            scale = 1 + np.abs(y).max(axis=1)
+            ok &= np.isfinite(y).all(axis=1)
+            ok &= np.abs(step).max(axis=1) <= 1e-6 * scale
+            # Accept: move on and grow the step, reject: halve it
+            acc, rej = i[ok], i[~ok]
+            x[acc], t[acc] = y[ok], tn[ok]
+            h[acc] = np.minimum(h[acc] * 1.5, 0.1)
+            h[rej] /= 2
+            active[i] = (t[i] < 1) & (h[i] > 1e-12) & (scale < 1e8)
+    done = (t >= 1) & np.isfinite(x).all(axis=1)
+    x = x[done]
+    # Polish on F itself
+    with np.errstate(all="ignore"):
+        for _ in range(10):
+            try:
+                x = x - np.linalg.solve(f.jacobian(x), f(x)[..., None])[..., 0]
+            except np.linalg.LinAlgError:
+                break
+        res = np.abs(f(x)).max(axis=1) if len(x) else np.zeros(0)
+    return x[np.isfinite(res) & (res <= tol**0.5 * (1 + np.abs(x).max(axis=1)))]
+
+
+def _clean(z: complex, tol: float) -> complex:
+    """Zero the parts of `z` that are roundoff relative to its size"""
+    eps = tol * max(1, abs(z))
+    return complex(
+        z.real if abs(z.real) > eps else 0, z.imag if abs(z.imag) > eps else 0
+    )
+
+
+def homotopy_solve(
+    eqns: Iterable[Comparison], vars: Sequence[Var], tol: float = 1e-10
+) -> set[tuple] | None:
+    """
+    Approximate all isolated solutions of a square polynomial system by
+    total-degree homotopy continuation. Returns None when the system is
+    not of that form.
+    """
+    if (f := compile_system(eqns, vars)) is None:
+        return
+    res = {}
+    for x in track(f, tol):
+        # Paths converging to the same (possibly multiple) root
+        key = tuple(complex(round(z.real, 6), round(z.imag, 6)) for z in x)
+        res.setdefault(key, x)
+    # Newton only converges linearly to multiple roots: trust about √tol
+    return {
+        tuple(simplify_complex(_clean(complex(z), tol**0.5)) for z in x)
+        for x in res.values()
+    }
+
+
+__all__ = ["PolySystem", "compile_system", "track", "homotopy_solve"]
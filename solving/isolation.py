@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from fractions import Fraction
+from typing import Sequence, TYPE_CHECKING
+import math
+
+import utils
+import utils.limits as limits
+from datatypes.expr import Add, Const, Float, Var
+from .utils import get_vars
+
+if TYPE_CHECKING:
+    from datatypes.base import Expr
+
+# Polynomials are coefficient lists from the constant term up: [a₀, a₁, ..., aₙ]
+Interval = tuple[Fraction, Fraction]
+
+
+def integer_coeffs(f: Sequence[Expr]) -> list[int] | None:
+    """
+    Scale real rational coefficients (highest degree first, as from
+    utils.extract) to a primitive integer polynomial, lowest degree first.
+    """
+    if any(c.__class__ is not Const or c.numerator.imag for c in f):
+        return
+    den = math.lcm(*(c.denominator for c in f))
+    p = [c.numerator * (den // c.denominator) for c in reversed(f)]
+    while p and not p[-1]:
+        p.pop()
+    if len(p) < 2:
+        return
+    g = math.gcd(*p)
+    return [c // g for c in p]
+
+
+def evaluate(p: Sequence, x: Fraction) -> Fraction:
+    res = Fraction(0)
+    for c in reversed(p):
+        res = res * x + c
+    return res
+
+
+def derivative(p: Sequence) -> list:
+    return [i * c for i, c in enumerate(p) if i]
+
+
+def divmod_poly(p: Sequence, q: Sequence) -> tuple[list, list]:
+    p = [Fraction(c) for c in p]
+    quo = [Fraction(0)] * max(len(p) - len(q) + 1, 0)
+    while len(p) >= len(q) and any(p):
+        k = p[-1] / q[-1]
+        d = len(p) - len(q)
+        quo[d] = k
+        for i, c in enumerate(q):
+            p[i + d] -= k * c
+        p.pop()
+    while p and not p[-1]:
+        p.pop()
+    return quo, p
+
+
+def primitive(p: Sequence[Fraction]) -> list[int]:
+    den = math.lcm(*(Fraction(c).denominator for c in p))
+    p = [int(c * den) for c in p]
+    g = math.gcd(*p)
+    if p[-1] < 0:
+        g = -g
+    return [c // g for c in p]
+
+
+def square_free(p: list[int]) -> list[int]:
+    """Divide out repeated factors: p / gcd(p, p')"""
+    a, b = p, derivative(p)
+    while b:
+        a, b = b, divmod_poly(a, b)[1]
+    if len(a) == 1:
+        return primitive(p)
+    return primitive(divmod_poly(p, a)[0])
+
+
+def sign_variations(p: Sequence) -> int:
+    signs = [c > 0 for c in p if c]
+    return sum(i != j for i, j in zip(signs, signs[1:]))
+
+
+def taylor_shift(p: Sequence[int]) -> list[int]:
+    """p(x + 1)"""
+    p = list(p)
+    n = len(p)
+    for i in range(n):
+        for j in range(n - 2, i - 1, -1):
+            p[j] += p[j + 1]
+    return p
+
+
+def _positive_roots(p: list[int]) -> list[Interval]:
+    """
+    Vincent–Collins–Akritas bisection: isolate the positive roots of a
+    square-free p with p(0) != 0.
+    """
+    # Cauchy bound, rounded up to a power of two to keep the scaled p integral
+    bound = 1 + max(Fraction(abs(c), abs(p[-1])) for c in p[:-1])
+    k = math.ceil(bound).bit_length()
+    res = []
+    stack = [([c << (k * i) for i, c in enumerate(p)], Fraction(0), Fraction(1 << k))]
+    while stack:
+        limits.checkpoint("isolation.positive_roots")
+        p, a, b = stack.pop()
+        # Descartes' rule on (0, 1): sign variations of (x + 1)ⁿ p(1 / (x + 1))
+        v = sign_variations(taylor_shift(p[::-1]))
+        if not v:
+            continue
+        if v == 1:
+            res.append((a, b))
+            continue
+        m = (a + b) / 2
+        n = len(p) - 1
+        left = [c << (n - i) for i, c in enumerate(p)]  # 2ⁿ p(x / 2)
+        right = taylor_shift(left)  # 2ⁿ p((x + 1) / 2)
+        if not right[0]:
+            res.append((m, m))
+            right = right[1:]
+        stack.append((left, a, m))
+        stack.append((right, m, b))
+    return res
+
+
+def isolate_real_roots(p: list[int]) -> list[Interval]:
+    """
+    Disjoint isolating intervals, in increasing order, for the distinct
+    real roots of the integer polynomial `p`. Each open interval (a, b)
+    holds exactly one root; rational roots that were hit exactly are (r, r).
+    """
+    p = square_free(p)
+    res = []
+    if not p[0]:
+        res.append((Fraction(0), Fraction(0)))
+        p = p[1:]
+    if len(p) > 1:
+        neg = [-c if i % 2 else c for i, c in enumerate(p)]
+        res.extend((-b, -a) for a, b in _positive_roots(neg))
+        res.extend(_positive_roots(p))
+    res.sort()
+    return res
+
+
+def refine(p: list[int], interval: Interval, eps: Fraction) -> Interval:
+    """
+    Bisect an isolating interval of `p` until it is narrower than `eps`.
+    `p` must not vanish at the interval's endpoints.
+    """
+    a, b = interval
+    sa = evaluate(p, a) > 0
+    while b - a > eps:
+        limits.checkpoint("isolation.refine")
+        m = (a + b) / 2
+        if not (v := evaluate(p, m)):
+            return m, m
+        if (v > 0) == sa:
+            a = m
+        else:
+            b = m
+    return a, b
+
+
+def real_roots(f: Sequence[Expr], rel_tol: float = 1e-12) -> list[Expr] | None:
+    """
+    Certified real roots of a univariate polynomial with rational
+    coefficients `f` (highest degree first), in increasing order.
+    Rational roots found along the way are exact, the rest are refined
+    to within `rel_tol`. Returns None when the coefficients are not rational.
+    """
+    if (res := isolated_roots(f, rel_tol)) is None:
+        return
+    return [root for _, root in res]
+
+
+def isolated_roots(
+    f: Sequence[Expr], rel_tol: float = 1e-12
+) -> list[tuple[Interval, Expr]] | None:
+    """Like real_roots, but each root comes with its isolating interval"""
+    if (p := integer_coeffs(f)) is None:
+        return
+    intervals = isolate_real_roots(p)
+    # Divide out exact roots so no isolating interval ends on a root
+    q = square_free(p)
+    for a, b in intervals:
+        if a == b:
+            q = primitive(divmod_poly(q, [-a.numerator, a.denominator])[0])
+    res = []
+    for interval in intervals:
+        a, b = interval
+        if a != b:
+            eps = Fraction(rel_tol) * max(1, abs(a), abs(b))
+            a, b = refine(q, (a, b), eps)
+            # Rational roots have denominators dividing the leading coefficient
+            r = ((a + b) / 2).limit_denominator(abs(q[-1]))
+            if a <= r <= b and not evaluate(q, r):
+                a = b = r
+        if a == b:
+            res.append((interval, Const(a.numerator, a.denominator)))
+        else:
+            res.append((interval, Float(float((a + b) / 2))))
+    return res
+
+
+def polynomial_roots(node: Expr, var: Var) -> list[tuple[Interval, Expr]] | None:
+    """
+    Certified real roots of the numerator of `node`, with their isolating
+    intervals, when it is a polynomial in `var` alone with rational
+    coefficients. Returns None otherwise.
+    """
+    num = node.as_ratio()[0].expand()
+    if num.__class__ is not Add or not utils.is_polynomial(num):
+        return
+    if get_vars(num) != {var}:
+        return
+    return isolated_roots(utils.extract(num, var))
+
+
+__all__ = [
+    "integer_coeffs",
+    "isolate_real_roots",
+    "refine",
+    "real_roots",
+    "isolated_roots",
+    "polynomial_roots",
+]
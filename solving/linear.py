@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable, Sequence, TYPE_CHECKING
+import math
+
+import utils
+import utils.limits as limits
+from datatypes.expr import Const, Var
+
+if TYPE_CHECKING:
+    from utils.sparse import Sparse
+    from .comparison import Comparison
+    from .system import System
+
+
+def linear_coefficients(
+    eqns: Iterable[Comparison], vars: Sequence[Var]
+) -> list[list[int]] | None:
+    """
+    The augmented integer matrix [A | b] of A·vars = b, each row scaled by
+    the lcm of its denominators. Returns None unless every equation is linear
+    in `vars` with real rational coefficients and no other variables.
+    """
+    index = {v: i for i, v in enumerate(vars)}
+    rows = []
+    for eqn in eqns:
+        if eqn.rel.name != "EQ":
+            return
+        terms = utils.sparse.monomials((eqn.left - eqn.right).expand())
+        if terms is None:
+            return
+        row = [Const(0)] * (len(vars) + 1)
+        for coef, exps in terms:
+            if coef.__class__ is not Const or coef.numerator.imag:
+                return
+            if not exps:
+                row[-1] -= coef
+                continue
+            if len(exps) > 1 or (v := next(iter(exps))) not in index or exps[v] != 1:
+                return
+            row[index[v]] += coef
+        den = math.lcm(*(c.denominator for c in row))
+        rows.append([c.numerator * (den // c.denominator) for c in row])
+    return rows
+
+
+def bareiss(rows: list[list[int]]) -> tuple[list[list[int]], list[int]]:
+    """
+    Fraction-free (Bareiss) Gauss–Jordan elimination of an augmented integer
+    matrix, in place. Returns the reduced matrix and the pivot column of
+    each of its leading rows.
+    """
+    n = len(rows[0]) - 1
+    prev = 1
+    pivots = []
+    r = 0
+    for c in range(n):
+        limits.checkpoint("linear.bareiss")
+        p = next((i for i in range(r, len(rows)) if rows[i][c]), None)
+        if p is None:
+            continue
+        rows[r], rows[p] = rows[p], rows[r]
+        pivot = rows[r]
+        for i, row in enumerate(rows):
+            if i == r:
+                continue
+            k = row[c]
+            # Every entry is a minor of the original matrix, so the division is exact
+            for j in range(n + 1):
+                row[j] = (pivot[c] * row[j] - k * pivot[j]) // prev
+        prev = pivot[c]
+        pivots.append(c)
+        r += 1
+    return rows, pivots
+
+
+# A sparse row {column: coefficient}, the constant term is in column len(vars)
+Row = dict[int, "Sparse"]
+
+
+def parametric_coefficients(
+    eqns: Iterable[Comparison], vars: Sequence[Var]
+) -> tuple[tuple[Var, ...], list[Row]] | None:
+    """
+    Sparse rows of a system linear in `vars` whose coefficients are
+    polynomials in the remaining variables (the parameters), along with
+    those parameters. Returns None unless every equation is of that form.
+    """
+    index = {v: i for i, v in enumerate(vars)}
+    n = len(vars)
+    eqns = [utils.sparse.monomials((eqn.left - eqn.right).expand()) for eqn in eqns]
+    if any(t is None for t in eqns):
+        return
+    params = tuple(sorted({v for t in eqns for _, e in t for v in e} - index.keys()))
+    rows = []
+    for terms in eqns:
+        row = {}
+        for coef, exps in terms:
+            if coef.__class__ is not Const or coef.numerator.imag:
+                return
+            col = [v for v in exps if v in index]
+            if len(col) > 1 or col and exps[col[0]] != 1:
+                return
+            col = index[col[0]] if col else n
+            e = tuple(exps.get(v, 0) for v in params)
+            row[col] = utils.sparse_add(row.get(col, {}), {e: coef})
+        rows.append({c: p for c, p in row.items() if p})
+    return params, rows
+
+
+def _primitive(row: Row, n: int) -> Row:
+    """
+    Divide out the polynomial content of a row. A row without variables,
+    0 = b, only loses its numeric content: b's parameters are the condition
+    for it to hold.
+    """
+    if not row:
+        return row
+    if all(c >= n for c in row):
+        return {c: utils.sparse.primitive(p) for c, p in row.items()}
+    g = None
+    for p in row.values():
+        g = p if g is None else utils.sparse_gcd(g, p)
+        if len(g) == 1 and not any(max(g)):
+            break
+    if len(g) > 1 or any(max(g)):
+        row = {c: utils.sparse_div(p, g) for c, p in row.items()}
+    # Clear denominators and numeric content
+    cols = list(row)
+    scaled = utils.sparse.primitive(
+        {(i, *e): v for i, c in enumerate(cols) for e, v in row[c].items()}
+    )
+    res = {c: {} for c in cols}
+    for (i, *e), v in scaled.items():
+        res[cols[i]][tuple(e)] = v
+    return res
+
+
+def markowitz(rows: list[Row], n: int) -> list[tuple[int, int]]:
+    """
+    Sparse fraction-free Gauss–Jordan elimination of polynomial rows in place.
+    Pivots minimize the Markowitz cost (r - 1)(c - 1), then the size of the
+    pivot, and each updated row is divided by its content so entries stay small.
+    Returns the (row, column) of each pivot.
+    """
+    rows[:] = [_primitive(row, n) for row in rows]
+    active = set(range(len(rows)))
+    pivots = []
+    while True:
+        limits.checkpoint("linear.markowitz")
+        counts = defaultdict(int)
+        for i in active:
+            for c in rows[i]:
+                counts[c] += 1
+        best = min(
+            (
+                ((len(rows[i]) - 1) * (counts[c] - 1), len(p), i, c)
+                for i in active
+                for c, p in rows[i].items()
+                if c < n
+            ),
+            default=None,
+        )
+        if best is None:
+            return pivots
+        *_, r, c = best
+        active.remove(r)
+        pivots.append((r, c))
+        pivot = rows[r]
+        for i, row in enumerate(rows):
+            if i == r or c not in row:
+                continue
+            k = row[c]
+            res = {j: utils.sparse_mul(pivot[c], p) for j, p in row.items()}
+            for j, p in pivot.items():
+                res[j] = utils.sparse_sub(res.get(j, {}), utils.sparse_mul(k, p))
+            rows[i] = _primitive({j: p for j, p in res.items() if p}, n)
+
+
+def solve_parametric(eqns: Iterable[Comparison], vars: Sequence[Var]) -> System | None:
+    """
+    Solve a system linear in `vars` with polynomial coefficients in other
+    variables. Solutions are generic: they hold wherever their denominators
+    don't vanish. Returns None when the system is not of that form.
+    """
+    from .comparison import Comparison
+    from .system import System
+
+    if (res := parametric_coefficients(eqns, vars)) is None:
+        return
+    params, rows = res
+    n = len(vars)
+    pivots = markowitz(rows, n)
+    # Leftover rows are 0 = b: inconsistent when b is a nonzero constant,
+    # and a condition on the parameters otherwise, left to the caller
+    rest = [row for i, row in enumerate(rows) if i not in dict(pivots) and row]
+    if any(any(e) for row in rest for e in row[n]):
+        return
+    if rest:
+        return System()
+    if len(pivots) < n:
+        raise ArithmeticError(
+            "Underdetermined system: Not enough equations to solve for all variables"
+        )
+    sols = []
+    for r, c in pivots:
+        num = utils.from_sparse(
+            {e: -v for e, v in rows[r].get(n, {}).items()}, params
+        )
+        den = utils.from_sparse(rows[r][c], params)
+        sols.append(Comparison(vars[c], num / den).factor())
+    return System(sols)
+
+
+def solve_linear(eqns: Iterable[Comparison], vars: Sequence[Var]) -> System | None:
+    """
+    Solve a system of linear equations by fraction-free elimination: over
+    the integers for rational coefficients, over polynomials in the other
+    variables otherwise. Returns None when the system is not linear.
+    """
+    from .comparison import Comparison
+    from .system import System
+
+    eqns = tuple(eqns)
+    if (rows := linear_coefficients(eqns, vars)) is None:
+        return solve_parametric(eqns, vars)
+    rows, pivots = bareiss(rows)
+    # Inconsistent: a row reduced to 0 = b with b != 0
+    if any(row[-1] for row in rows[len(pivots) :]):
+        return System()
+    if len(pivots) < len(vars):
+        raise ArithmeticError(
+            "Underdetermined system: Not enough equations to solve for all variables"
+        )
+    return System(
+        Comparison(vars[c], Const(rows[i][-1], rows[i][c]))
+        for i, c in enumerate(pivots)
+    )
+
+
+__all__ = [
+    "linear_coefficients",
+    "bareiss",
+    "parametric_coefficients",
+    "markowitz",
+    "solve_parametric",
+    "solve_linear",
+]
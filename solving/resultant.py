@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Iterable, TYPE_CHECKING
+
+import utils
+import utils.limits as limits
+from utils.sparse import content, lead, primitive, sparse_div, sparse_mul, sparse_prem
+from datatypes.expr import Const
+
+from .utils import arrange_eqns, eliminate_radicals
+
+if TYPE_CHECKING:
+    from datatypes.expr import Var
+    from utils.sparse import Sparse
+    from .comparison import Comparison
+
+
+def _pow(p: Sparse, n: int) -> Sparse:
+    res = {(0,) * len(max(p)): Const(1)}
+    for _ in range(n):
+        res = sparse_mul(res, p)
+    return res
+
+
+def resultant(a: Sparse, b: Sparse, k: int) -> Sparse:
+    """
+    Resultant of a and b with respect to their k-th generator, by the
+    subresultant PRS (Collins; Cohen, Algorithm 3.3.7).
+    """
+    if not a or not b:
+        return {}
+    da, db = lead(a, k)[0], lead(b, k)[0]
+    ca, cb = content(a, k), content(b, k)
+    a, b = sparse_div(a, ca), sparse_div(b, cb)
+    t = sparse_mul(_pow(ca, db), _pow(cb, da))
+    s = 1
+    if da < db:
+        a, b, da, db = b, a, db, da
+        if da % 2 and db % 2:
+            s = -1
+    g = h = {(0,) * len(max(a)): Const(1)}
+    while db:
+        limits.checkpoint("resultant.resultant")
+        d = da - db
+        if da % 2 and db % 2:
+            s = -s
+        r = sparse_prem(a, b, k, full=True)
+        if not r:
+            return {}
+        a, b = b, sparse_div(r, sparse_mul(g, _pow(h, d)))
+        g = lead(a, k)[1]
+        if d:
+            h = sparse_div(_pow(g, d), _pow(h, d - 1))
+        da, db = db, lead(b, k)[0]
+    h = sparse_div(_pow(lead(b, k)[1], da), _pow(h, da - 1))
+    return {e: c.mul(Const(s)) for e, c in sparse_mul(t, h).items()}
+
+
+def eliminate(
+    polys: list[Sparse], order: Iterable[int], max_terms: int = 200
+) -> list[Sparse] | None:
+    """
+    Triangulate polynomials by eliminating the generators in `order`, one at
+    a time, with resultants against a polynomial linear in it with a numeric
+    leading coefficient. The resultants then vanish exactly where the
+    eliminated generator has a (unique) common value, so back-substitution
+    neither picks up spurious roots nor has to choose between branches.
+    Returns None when there is no such polynomial, or when a resultant
+    vanishes or grows past `max_terms`.
+    """
+    res = []
+    for k in order:
+        has = [p for p in polys if lead(p, k)[0]]
+        if len(has) < 2:
+            continue
+        linear = [
+            p for p in has if (l := lead(p, k))[0] == 1 and not any(max(l[1]))
+        ]
+        if not linear:
+            return
+        f = min(linear, key=len)
+        res.append(f)
+        polys = [p for p in polys if not lead(p, k)[0]]
+        for p in has:
+            if p is f:
+                continue
+            if not (r := resultant(f, p, k)) or len(r) > max_terms:
+                return
+            r = primitive(r)
+            if r not in polys:
+                polys.append(r)
+    return res + polys
+
+
+def compute_resultants(
+    eqns: Iterable[Comparison], vars: list[Var], max_terms: int = 200
+) -> set[Comparison] | None:
+    """
+    Eliminate variables from polynomial equations with resultants, hardest
+    variable (by difficulty_weight) first. Returns None when the equations
+    aren't polynomials with real rational coefficients, or when resultants
+    blow up.
+    Like compute_grobner, it leaves `vars` in elimination order.
+    """
+    from .comparison import Comparison
+
+    weights = arrange_eqns(eqns, vars)
+    vars.reverse()
+    eqns = sorted(eqns, key=weights.get)
+    exprs = [eqn.normalize().left.as_ratio()[0].expand() for eqn in eqns]
+    exprs = [eliminate_radicals(expr, *vars) or expr for expr in exprs]
+    if (res := utils.to_sparse(*exprs)) is None:
+        return
+    gens, polys = res
+    if not set(gens) <= set(vars):
+        return
+    # primitive() takes integer gcds: leave the rest to Groebner bases
+    if any(
+        c.__class__ is not Const or c.numerator.imag for p in polys for c in p.values()
+    ):
+        return
+    order = [gens.index(v) for v in vars if v in gens]
+    if (polys := eliminate(polys, order, max_terms)) is None:
+        return
+    # A nonzero constant resultant: no common roots
+    if any(not any(max(p)) for p in polys):
+        return set()
+    return {Comparison(utils.from_sparse(p, gens), Const(0)) for p in polys}
+
+
+__all__ = ["resultant", "eliminate", "compute_resultants"]
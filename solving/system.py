@@ -6,12 +6,17 @@ from typing import Iterable
 
 
 from datatypes.base import Expr
+import utils
 import utils.steps as steps
+import utils.limits as limits
 from utils.steps import Step
 
 
 from datatypes import *
-from .utils import arrange_eqns, compute_grobner, next_eqn
+from .utils import arrange_eqns, compute_grobner, get_vars, next_eqn, triangular
+from .homotopy import homotopy_solve
+from .linear import solve_linear
+from .resultant import compute_resultants
 from .solutions import SolutionSet
 from utils.print_ import print_system
 
@@ -119,6 +124,52 @@ def _branched_solve(vals, sols):
     )
 
 
+def _back_substitute(levels) -> list[dict[Var, Expr]]:
+    """
+    Solve a triangular set level by level, substituting each branch's
+    values only into the equations of the level being solved.
+    """
+    from .comparison import Comparison
+
+    branches = [{}]
+    for v, eqns in levels:
+        limits.checkpoint("system.back_substitute")
+        res = []
+        with steps.scoped(inner := []):
+            for mapping in branches:
+                cands = [eqn.subs(mapping) for eqn in eqns] if mapping else eqns
+                # An equation reduced to a false constant: not a solution
+                if any(not (v in get_vars(i) or i or i.is_close()) for i in cands):
+                    continue
+                if not (cands := [eqn for eqn in cands if v in get_vars(eqn)]):
+                    raise ArithmeticError(
+                        "Underdetermined system: "
+                        "Not enough equations to solve for all variables"
+                    )
+                eqn, _ = next_eqn(cands, [v])
+                with steps.scoped(solve := []):
+                    sol = eqn.solve_for(v)
+                steps.register(Step("SOLVE", (eqn, v), sol, children=solve))
+                if sol.__class__ is not System:
+                    if sol.left != v:
+                        raise ArithmeticError(f"Could not solve for {v}")
+                    sol = [sol]
+                res.extend({**mapping, v: i.right} for i in sol if i.left == v)
+        branches = res
+        steps.register(
+            Step(
+                "SUBS",
+                (v, SolutionSet(i[v] for i in branches)),
+                SolutionSet(
+                    System(Comparison(k, val) for k, val in i.items()) for i in branches
+                ),
+                children=inner,
+                force_keep=True,
+            )
+        )
+    return branches
+
+
 def _foreach_solve(eqns, value):
     if not any(eqn.left != value for eqn in eqns):
         return eqns
@@ -145,18 +196,46 @@ def _foreach_solve(eqns, value):
 class System(frozenset):
     """A system of equations"""
 
-    def solve_for(self, vals: Iterable[Var], groebner=True) -> System:
+    @utils.persistent("solve")
+    def solve_for(
+        self, vals: Iterable[Var], groebner=True, resultants=True
+    ) -> System:
         if vals.__class__ is Var:
             return System(_foreach_solve(self, vals))
+        vals = list(vals)
+        # Verbose solves take the elimination below, which records its steps
+        if not steps.verbose() and (res := solve_linear(self, vals)) is not None:
+            return res
         if groebner:
-            vals = list(vals)
-            eqns = compute_grobner(self, vals)
+            # Resultants are much cheaper than a full basis for small systems
+            eqns = None
+            if resultants and len(vals) <= 3:
+                eqns = compute_resultants(self, order := list(vals))
+            if eqns is not None:
+                steps.register(
+                    Step(
+                        "ELIMINATE",
+                        (self, *order[:-1]),
+                        System(eqns),
+                        reason="Using resultants",
+                        force_keep=True,
+                    )
+                )
+            else:
+                eqns = compute_grobner(self, order := list(vals))
+                steps.register(eqns, reason="Eliminate variables using Groebner basis")
             if not eqns:
                 return System(eqns)
-            steps.register(eqns, reason="Eliminate variables using Groebner basis")
-            eqns = set(eqns)
-        else:
-            eqns = set(self)
+            from .comparison import Comparison
+
+            # Lex order triangular set: back-substitute once per branch
+            branches = _back_substitute(triangular(eqns, order))
+            sols = [
+                System(Comparison(v, i[v]) for v in reversed(order)).factor()
+                for i in branches
+            ]
+            return System(sols[0] if len(sols) == 1 else sols)
+        eqns = set(self)
         if len(eqns) < len(vals):
             raise ArithmeticError(
                 "Underdetermined system: Not enough equations to solve for all variables"
@@ -165,6 +244,7 @@ class System(frozenset):
         sols = []
         # Solve for each variable separately
         for _ in range(len(vals)):
+            limits.checkpoint("system.solve_for")
             # Branched solving: previous variable had multiple solutions
             if sols and sols[0].__class__ is tuple:
                 _branched_solve(vals, sols)
@@ -188,6 +268,20 @@ class System(frozenset):
     def is_close(self, threshold: float = 1e-7):
         return all(eqn.is_close(threshold) for eqn in self)
 
+    @steps.tracked("approximate")
+    def approx(self):
+        """All solutions of a polynomial system, by homotopy continuation"""
+        from .comparison import Comparison, CompRel
+
+        vars = tuple(sorted(get_vars(self)))
+        if (res := homotopy_solve(self, vars)) is None:
+            raise NotImplementedError(
+                "Approximation is only implemented for square polynomial systems"
+            )
+        if len(res) == 1:
+            return Comparison(vars, res.pop())
+        return Comparison(vars, SolutionSet(res), CompRel.IN)
+
     @steps.tracked()
     def expand(self):
         res = System(i.expand() for i in self)
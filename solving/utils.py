@@ -1,5 +1,6 @@
 from __future__ import annotations
 from typing import Iterable, Sequence, TYPE_CHECKING
+from fractions import Fraction
 import math
 import functools
 
@@ -62,7 +63,67 @@ def roots_cubic(f):
     return {(s - p / (3 * s) - a / 3).expand().factor() for s in s}
 
 
-def roots(f: list[Expr]):
+def _horner(f: Sequence[complex], z: complex) -> tuple[complex, complex]:
+    p = dp = 0
+    for c in f:
+        dp = dp * z + p
+        p = p * z + c
+    return p, dp
+
+
+def _exact_horner(
+    f: Sequence[tuple[Fraction, Fraction]], z: complex
+) -> tuple[complex, complex]:
+    """p(z) and p'(z) in exact rational arithmetic, rounded once at the end"""
+    x, y = Fraction(z.real), Fraction(z.imag)
+    pr = pi = dr = di = Fraction(0)
+    for a, b in f:
+        dr, di = dr * x - di * y + pr, dr * y + di * x + pi
+        pr, pi = pr * x - pi * y + a, pr * y + pi * x + b
+    return complex(float(pr), float(pi)), complex(float(dr), float(di))
+
+
+def polish_roots(
+    f: Sequence[Expr], z: Iterable[complex], tol: float = 1e-15, maxiter: int = 50
+) -> list[complex]:
+    """
+    Refine approximations `z` of all the roots of `f` simultaneously with
+    Aberth–Ehrlich iterations, until every correction is below `tol`
+    (relative). Residuals are evaluated exactly when `f` is rational.
+    """
+    z = [complex(i) for i in z]
+    if all(c.__class__ is Const for c in f):
+        f = [
+            (
+                Fraction(c.numerator.real, c.denominator),
+                Fraction(c.numerator.imag, c.denominator),
+            )
+            for c in f
+        ]
+        evaluate = _exact_horner
+    else:
+        f = [complex(c.approx()) for c in f]
+        evaluate = _horner
+    for _ in range(maxiter):
+        done = True
+        for i, zi in enumerate(z):
+            p, dp = evaluate(f, zi)
+            if not p or not dp:
+                continue
+            ratio = p / dp
+            s = sum(1 / (zi - zj) for zj in z if zj != zi)
+            if not (den := 1 - ratio * s):
+                continue
+            w = ratio / den
+            z[i] = zi - w
+            if abs(w) > tol * max(1, abs(z[i])):
+                done = False
+        if done:
+            break
+    return z
+
+
+def roots(f: list[Expr], tol: float = 1e-15, maxiter: int = 50):
     from numpy import roots
 
     d = len(f) - 1
@@ -78,7 +139,8 @@ def roots(f: list[Expr]):
     if d == 3:
         return nth_roots(roots_cubic(f), u)
     try:
-        return nth_roots(map(simplify_complex, roots([i.approx() for i in f])), u)
+        z = polish_roots(f, roots([i.approx() for i in f]), tol, maxiter)
+        return nth_roots(map(simplify_complex, z), u)
     except AttributeError:
         raise ValueError("High degree Multivariate polynomial")
 
@@ -111,6 +173,26 @@ def compute_grobner(
     return {Comparison(t, Const(0)) for t in G}
 
 
+def triangular(
+    eqns: Iterable[Comparison], vars: Sequence[Var]
+) -> list[tuple[Var, list[Comparison]]]:
+    """
+    Split a lex-order triangular set (a Groebner basis or resultant chain
+    over `vars`, highest first) by main variable: the highest one each
+    equation contains. Levels are returned lowest variable first.
+    """
+    levels = {v: [] for v in vars}
+    for eqn in eqns:
+        free = get_vars(eqn)
+        if (v := next((v for v in vars if v in free), None)) is not None:
+            levels[v].append(eqn)
+    if not all(levels.values()):
+        raise ArithmeticError(
+            "Underdetermined system: Not enough equations to solve for all variables"
+        )
+    return list(reversed(levels.items()))
+
+
 def eliminate_radicals(expr, *value):
 
     system = []
@@ -249,5 +331,7 @@ __all__ = [
     "domain_restriction",
     "difficulty_weight",
     "eliminate_radicals",
+    "triangular",
     "roots",
+    "polish_roots",
 ]
@@ -180,3 +180,38 @@ def test_merge():
     assert Counter(Add.merge([x**2, -(x**2)])) == Counter([0])
     # Constants only
     assert Counter(Add.merge([Const(1), Const(2), Const(3)])) == Counter([6])
+
+
+def test_sparse_multiply():
+    from utils import sparse_multiply, to_sparse, from_sparse
+
+    a = x**2 + 3 * x * y - 2
+    b = x * y**2 - y + Const(1, 2)
+    assert sparse_multiply(a, b) == Add.from_terms(i * j for i in a for j in b)
+    gens, (p,) = to_sparse(a)
+    assert gens == (x, y) and from_sparse(p, gens) == a
+    # Only polynomials with numeric coefficients
+    assert sparse_multiply(x + 1, x ** Const(1, 2) + 1) is None
+    assert sparse_multiply(x + 1, (y + 1) ** -1) is None
+    # Terms cancel out
+    assert ((x + y) * (x - y)).expand() == Add(x**2, -(y**2))
+
+
+def test_subs():
+    from utils import steps, free_vars
+
+    z = Var("z")
+    a = (x + 1) ** Const(1, 2)
+    expr = ((x + y + 1) ** 3).expand() * a + y / (x - 2)
+    assert free_vars(expr) == {x, y}
+    # Subtrees without the substituted variables are left as they are
+    assert expr.subs({z: Const(1)}) is expr
+    assert (a + y).subs({y: Const(2)}).args[0] is a
+    for mapping in [{y: Const(2)}, {x: y, y: x}, {x: Const(3, 2), y: x + 1}]:
+        res = expr.subs(mapping)
+        # Matches the step by step substitution
+        steps.set_verbosity(True)
+        try:
+            assert expr.subs(mapping) == res
+        finally:
+            steps.set_verbosity(False)
@@ -0,0 +1,120 @@
+import asyncio
+import io
+import json
+import time
+from concurrent.futures import Future
+
+from api import AsyncEngine, Pool, evaluate, handle, serve_stdio
+
+HARD = "(x + y + z + 1)^20 - 1"
+
+
+def test_evaluate():
+    assert evaluate("factor", "x^4 - 1") == {
+        "result": "(x - 1)(x + 1)(x² + 1)",
+        "tex": "(x-1)(x+1)({x}^{2}+1)",
+    }
+    res = evaluate("solve", "[x + y = a, x - y = b]", ["x", "y"])
+    assert "x = (a + b)/2" in res["result"]
+    res = evaluate("solve", "2x = 4", trace=True)
+    assert res["result"] == "x = 2" and res["steps"]
+    assert "steps" in evaluate("explain", "2x = 4")
+    summary = evaluate("solve", "x^2 - 5x + 6 = 0", trace={"maxdepth": 1})
+    assert summary["result"] == "x ∈ {2, 3}" and summary["steps"]
+    assert evaluate("parse", "2(x + 1")["error"]["type"] == "SyntaxError"
+    assert evaluate("factor", HARD, timeout=0.01)["error"]["type"] == "Timeout"
+
+
+def test_server():
+    with Pool(1) as pool:
+        req = {"jsonrpc": "2.0", "id": 1, "method": "expand"}
+        res = handle(pool, {**req, "params": {"expr": "(x + 1)^2"}})
+        assert res == {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": {"result": "x² + 2x + 1", "tex": "{x}^{2}+2x+1"},
+        }
+        assert handle(pool, {"id": 2, "method": "nope"})["error"]["code"] == -32601
+        assert handle(pool, {"id": 3, "method": "solve"})["error"]["code"] == -32602
+        for params in [
+            {"timeout": "5"},
+            {"timeout": -1},
+            {"vars": "x"},
+            {"vars": [1]},
+            {"trace": "yes"},
+            {"trace": {"depth": 1}},
+        ]:
+            req = {"id": 3, "method": "solve", "params": {"expr": "x+1", **params}}
+            assert handle(pool, req)["error"]["code"] == -32602
+        params = {"expr": "2x = 4", "timeout": 5, "trace": {"maxdepth": 1}}
+        assert handle(pool, {"id": 3, "method": "solve", "params": params})["result"]
+        # Unexpected failures still make a reply
+        broken = Future()
+        broken.set_exception(RuntimeError("worker died"))
+        assert pool.result(broken)["error"]["type"] == "RuntimeError"
+        req = {"id": 4, "method": "factor", "params": {"expr": HARD}}
+        res = handle(pool, req, 0.01)
+        assert res["error"]["code"] == -32001
+
+        # Cancelling a request while a worker is computing it
+        fut = pool.submit("factor", HARD)
+        while not fut.running():
+            time.sleep(0.01)
+        time.sleep(0.1)
+        # A request that finished and gave its slot away can't flag it
+        stale = Future()
+        stale.set_running_or_notify_cancel()
+        stale.slot = fut.slot
+        pool.cancel(stale)
+        assert not pool._flags[fut.slot]
+        pool.cancel(fut)
+        assert pool.result(fut, 5)["error"]["type"] == "Cancelled"
+
+        # Arbitrary calls, with their errors raised here
+        assert pool.call(max, 1, 2).result() == 2
+        try:
+            pool.call(int, "x").result()
+            assert False
+        except ValueError:
+            pass
+
+        lines = [
+            {"id": 1, "method": "solve", "params": {"expr": "2x = 4"}},
+            {"id": 2, "method": "factor", "params": {"expr": "x^2 - 1"}},
+            {"id": 3, "method": "factor", "params": {"expr": "x", "timeout": "5"}},
+        ]
+        src = "\n".join(map(json.dumps, lines)) + "\nbad\n"
+        out = io.StringIO()
+        serve_stdio(pool, stdin=io.StringIO(src), stdout=out)
+    res = {i.get("id"): i for i in map(json.loads, out.getvalue().splitlines())}
+    assert res[1]["result"]["result"] == "x = 2"
+    assert res[2]["result"]["result"] == "(x - 1)(x + 1)"
+    assert res[3]["error"]["code"] == -32602
+    assert res[None]["error"]["code"] == -32700
+
+
+def test_async():
+    async def run():
+        async with AsyncEngine(workers=1) as engine:
+            res = await engine.factor("x^2 - 1")
+            assert res["result"] == "(x - 1)(x + 1)"
+
+            stream = engine.stream("solve", "[x + y = 5, xy = 6]")
+            trace = [step async for step in stream]
+            assert len(trace) > 1
+            assert str(trace[0]).startswith("Using resultants")
+            assert (await stream)["result"] == "(x, y) ∈ {(2, 3), (3, 2)}"
+
+            # Cancelling the awaiting task frees the worker
+            task = asyncio.create_task(engine.factor(HARD))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            try:
+                await task
+                assert False
+            except asyncio.CancelledError:
+                pass
+            res = await asyncio.wait_for(engine.expand("(x + 1)^2"), 5)
+            assert res["result"] == "x² + 2x + 1"
+
+    asyncio.run(run())
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+
+from benchmarks import WORKLOADS, run, compare
+
+
+def test_benchmarks():
+    res = run(["mul", "expand"], repeat=2)
+    assert set(res["results"]) == {
+        f"{name}[{size}]"
+        for name in ("mul", "expand")
+        for size in WORKLOADS[name].sizes
+    }
+    assert all(r["min"] <= r["median"] for r in res["results"].values())
+    rows = compare(res, res)
+    assert len(rows) == len(res["results"])
+    assert all(ratio == 1 and not verdict for *_, ratio, verdict in rows)
+    slow = {"results": {k: {"min": 2 * v["min"]} for k, v in res["results"].items()}}
+    assert all(verdict == "slower" for *_, verdict in compare(res, slow))
+
+
+def test_lazy_imports():
+    # The UI dependencies are only loaded to render
+    src = "import sys, parsing; print(*sorted(sys.modules))"
+    res = subprocess.run([sys.executable, "-c", src], capture_output=True, text=True)
+    modules = {i.split(".")[0] for i in res.stdout.split()}
+    assert "parsing" in modules
+    assert not modules & {"rich", "wrapt", "pylatexenc"}
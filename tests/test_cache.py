@@ -0,0 +1,77 @@
+import pytest
+import pickle
+from datatypes.expr import *
+from parsing import parser
+from utils import factor, clear_all_caches
+from utils.cache import PersistentCache, enable_cache, disable_cache, serialize
+
+x = Var("x")
+y = Var("y")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    yield enable_cache(str(tmp_path / "cache.db"))
+    disable_cache()
+
+
+def test_pickle_roundtrip():
+    for expr in [
+        Const(3, 4),
+        Const(2 + 3j, 5),
+        Float(1.5),
+        x + 1,
+        2 * x * y,
+        (x + 1) ** Const(1, 2),
+        Const(2) ** Const(1, 2),
+        parser.parse("[x + y = 5, 3x = 4y + 1]", False),
+    ]:
+        res = pickle.loads(pickle.dumps(expr))
+        assert res == expr and hash(res) == hash(expr)
+
+
+def test_serialize_canonical():
+    assert serialize(x + y) == serialize(y + x)
+    assert serialize(Float(0.123456789)) != serialize(Float(0.12345679))
+    assert serialize({x + 1, y}) == serialize({y, x + 1})
+
+
+def test_warm_restart(cache, tmp_path):
+    expr = (x**4 - y**4).expand()
+    res = factor(expr)
+    assert len(cache) == 1
+    disable_cache()
+    clear_all_caches()
+
+    cache = enable_cache(str(tmp_path / "cache.db"))
+    assert len(cache) == 1
+    assert cache.get("factor", ((expr,), {})) == (True, res)
+    assert factor(expr) == res
+    assert parser.parse("[x + y = 5, 3x = 4y + 1]") == parser.parse(
+        "[x + y = 5, 3x = 4y + 1]"
+    )
+
+
+def test_versioning(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = PersistentCache(path, version="1")
+    cache.put("factor", x, x + 1)
+    cache.close()
+    cache = PersistentCache(path, version="1")
+    assert cache.get("factor", x) == (True, x + 1)
+    cache.close()
+    cache = PersistentCache(path, version="2")
+    assert cache.get("factor", x) == (False, None)
+    cache.close()
+
+
+def test_lru_eviction(tmp_path):
+    cache = PersistentCache(str(tmp_path / "cache.db"), max_entries=2)
+    cache.put("op", 1, x)
+    cache.put("op", 2, y)
+    assert cache.get("op", 1)[0]
+    cache.put("op", 3, x + y)
+    assert len(cache) == 2
+    assert cache.get("op", 1)[0] and cache.get("op", 3)[0]
+    assert not cache.get("op", 2)[0]
+    cache.close()
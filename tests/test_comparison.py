@@ -171,6 +171,65 @@ def test_solve_inequalities():
     ).right == ({0}, Interval(1, None, (True, True)))
 
 
+def test_isolate_real_roots():
+    from fractions import Fraction
+    from solving.isolation import isolate_real_roots, real_roots
+
+    # 2x³ - 3x² - 3x + 2 = (x + 1)(2x - 1)(x - 2), squared
+    p = [4, -12, -3, 26, -3, -12, 4]
+    intervals = isolate_real_roots(p)
+    assert len(intervals) == 3
+    assert all(a <= r <= b for r, (a, b) in zip((-1, Fraction(1, 2), 2), intervals))
+    assert real_roots([Const(2), Const(-3), Const(-3), Const(2)]) == [
+        Const(-1),
+        Const(1, 2),
+        Const(2),
+    ]
+    # x⁵ - 3x + 1 has three real roots
+    res = real_roots([Const(1), Const(0), Const(0), Const(0), Const(-3), Const(1)])
+    assert [round(i.approx(), 6) for i in res] == [-1.388792, 0.334734, 1.214648]
+    # Clustered roots ±√(10⁸ ± 1)
+    res = real_roots(
+        [Const(1), Const(0), Const(-2 * 10**8), Const(0), Const(10**16 - 1)]
+    )
+    assert len(res) == 4 and res[1].approx() < -9999.9999 < res[2].approx()
+
+
+def test_polish_roots():
+    from solving.utils import polish_roots, roots
+
+    # (x - 1)²(x⁴ - 3x + 1): numpy splits the double root into a complex pair
+    f = [Const(i) for i in (1, -2, 1, -3, 7, -5, 1)]
+    res = [r.approx() for r in roots(f)]
+    assert len(res) == 5 and sum(not r.imag for r in res) == 3 and 1 in res
+    # Wilkinson's polynomial (x - 1)(x - 2)...(x - 12)
+    f = [Const(1)]
+    for k in range(1, 13):
+        f = [a - k * b for a, b in zip(f + [Const(0)], [Const(0)] + f)]
+    z = polish_roots(f, [k + 1e-6 for k in range(1, 13)])
+    assert all(abs(r - k) < 1e-14 for k, r in enumerate(z, 1))
+
+
+def test_solve_clustered_inequalities():
+    res = solve(
+        parser.parse("x^4 - 200000000x^2 + 9999999999999999 < 0", False), x
+    ).right
+    assert isinstance(res, IntervalUnion) and len(res) == 2
+    res = solve(parser.parse("x^5 - 3x + 1 > 0", False), x).right
+    assert [round(i.approx(), 4) for j in res for i in (j.start, j.end) if i] == [
+        -1.3888,
+        0.3347,
+        1.2146,
+    ]
+    # Only the numeric roots are certified: exact endpoints stay exact
+    res = solve(parser.parse("(x^2 - 2)(x^5 - 3x + 1) > 0", False), x).right
+    ends = [i for j in res for i in (j.start, j.end) if i]
+    assert ends[0] == -(Const(2) ** Const(1, 2)) and ends[-1] == Const(2) ** Const(1, 2)
+    assert [round(i.approx(), 4) for i in ends[1:-1]] == [-1.3888, 0.3347, 1.2146]
+    res = solve(parser.parse("(3x - 1)(x^5 - 3x + 1) <= 0", False), x).right
+    assert Const(1, 3) in [i for j in res for i in (j.start, j.end)]
+
+
 def test_solve_radicals():
     # 3x^3=(2+((x-3)^3)^(1/5)+x^.5)^(1/3)-x^2
     # (a+3)^.5+(a^2-4)^(1/3)=4
@@ -358,3 +358,22 @@ def test_alt_syntax():
         Token(TokenType.MUL),
         Token(TokenType.CONST, Const(3)),
     ]
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "3x^2 - 5xy + 2(x - 1)(y + 4) - 7/3 z = 12",
+        "sqrt(x + 1)2i - .5ab >= approx(2)",
+        "[x + y = 5, xy = 6]",
+        "3 4",
+        "x2",
+        "2..1 + x",
+        "x ! y",
+        "factorx(2)",
+    ],
+)
+def test_plain_text(expr):
+    # The plain text fast path lexes like the LaTeX walker
+    latex = Lexer.insert_operators(Lexer(expr).latex_tokens())
+    assert repr(list(Lexer(expr).tokenize())) == repr(list(latex))
@@ -222,11 +222,13 @@ def test_validate_inputs():
     for func in un_funcs:
         with pytest.raises(SyntaxError):
             Function(func)
-        for i in [c, s, t]:
+        for i in [c, t] if func == "approx" else [c, s, t]:
             with pytest.raises(TypeError):
                 Function(func, i)
         for i in [n, x, m, a, p]:
             Function(func, i)
+    # Numeric solutions of a polynomial system
+    Function("approx", s)
 
     # LCM and GCD
     for func in ["lcm", "gcd"]:
@@ -5,3 +5,22 @@ from datatypes.expr import Const, Var, Add, Mul, Pow
 # Currently, all the nodes perform evaluation at construction.
 # This makes side to side comparison a bit circular, but gets the job done.
 # This file is skipped because variable power rules are not implemented
+
+
+x = Var("x")
+y = Var("y")
+
+
+def test_multinomial_expand():
+    assert ((x + 1) ** 3).expand() == x**3 + 3 * x**2 + 3 * x + 1
+    assert ((2 * x - 3 * y) ** 2).expand() == 4 * x**2 - 12 * x * y + 9 * y**2
+    assert ((x + y + 1) ** 2).expand() == Add(
+        x**2, y**2, 2 * x * y, 2 * x, 2 * y, Const(1)
+    )
+    # Terms whose powers collapse into sums are still distributed
+    assert ((y + (x + 1) ** Const(1, 2)) ** 2).expand() == Add(
+        y**2, 2 * y * (x + 1) ** Const(1, 2), x, Const(1)
+    )
+    assert ((x + 1) ** Const(3, 2)).expand() == Pow(
+        x**3 + 3 * x**2 + 3 * x + 1, Const(1, 2)
+    )
@@ -0,0 +1,43 @@
+from datatypes.expr import *
+from parsing import parser
+from utils import clear_all_caches, factor
+from utils.profile import profile
+
+x = Var("x")
+
+
+def test_profile():
+    merge, func = Add.__dict__["merge"], factor.func
+    clear_all_caches()
+    with profile() as prof:
+        factor((x**4 - 1).expand())
+        parser.parse("[x + y = 5, xy = 6]")
+        with profile() as inner:
+            x + 1
+    report = prof.report()
+    ops = report["operations"]
+    assert ops["factor"]["calls"] >= 1 and ops["factor"]["time"] > 0
+    assert ops["from_terms"]["calls"] >= ops["Add.merge"]["calls"] > 0
+    assert "time" not in ops["system.back_substitute"]
+    assert ops["comparison.solve_for"]["calls"] > 0
+    assert ops["from_terms"]["time"] <= report["elapsed"]
+    # Nested profiles only see their own calls
+    assert inner.report()["operations"]["from_terms"]["calls"] == 1
+    assert "factor" not in inner.report()["operations"]
+    # Uninstrumented again
+    assert Add.__dict__["merge"] is merge
+    assert factor.func is func
+
+
+def test_loop_counters():
+    from solving.utils import compute_grobner
+
+    clear_all_caches()
+    eqns = parser.parse("[x + y = 5, xy = 6, x^2 + z = 1]", False)
+    with profile() as prof:
+        compute_grobner(eqns, [x, Var("y"), Var("z")])
+    ops = prof.report()["operations"]
+    # Buchberger's pairs and the reductions they take are counted apart
+    assert ops["groebner.pair"]["calls"] > 0
+    assert ops["groebner.reduce"]["calls"] > 0
+    assert "groebner" not in ops
@@ -1,8 +1,12 @@
 import pytest
 import gc
+import io
+import pickle
+import threading
 from parsing import parser
 from datatypes import *
 from utils.steps import step as steps
+from utils.steps import limit_trace, tracked
 from utils import clear_all_caches
 
 
@@ -96,8 +100,122 @@ def test_keeps_substeps(expr):
         assert n.result is not None
 
 
+@pytest.mark.parametrize(
+    "expr",
+    ["x-sqrt(x)/2>=0", "[x^2 + y^2 = 25, x^2 - 9 = y^2 - 2]", "2(x - 1) = 4"],
+)
+def test_pickle(expr):
+    hist = steps.explain(parser.parse(expr))
+    copy = pickle.loads(pickle.dumps(hist))
+    # Systems are sets, so their steps may print in another order
+    assert [(n.type, n.reason, n.result) for n in walk(copy)] == [
+        (n.type, n.reason, n.result) for n in walk(hist)
+    ]
+
+
 def test_simplifying_steps():
     x = Var("x")
     expr = 3 * x - 5 + 2
     hist = steps.explain(expr, False)
     assert hist == steps.Step("ADD", (3 * x - 5, 2), expr)
+
+
+def test_linear_system_steps():
+    res = parser.parse("[x + y = 5, x - y = 1]")
+    assert str(res) == "(x, y) = (3, 2)"
+    hist = steps.explain(res, maxdepth=None)
+    # Elimination and back-substitution, not one opaque step
+    assert any(n.type is steps.OPSpecials.ELIMINATE for n in walk(hist))
+    assert any(n.type is steps.OPSpecials.SUBS for n in walk(hist))
+
+
+@pytest.mark.parametrize(
+    "expr", ["sqrt(x+1)/(2x^(1/3)) + 3/(x-1)^2 = 4", "(x-1)(x+2)(2x-3) > 0"]
+)
+def test_cached_rendering(expr):
+    from rich.text import Text
+
+    hist = steps.explain(parser.parse(expr), maxdepth=None)
+    for n in walk(hist):
+        # Headers are converted piecewise, so the pieces can be cached
+        assert steps.header_markup(n) == Text.from_ansi(n.header()).markup
+        for arg in (*n.args, n.result):
+            if arg.__class__ in (Add, Mul, Pow):
+                assert arg.totex() == type(arg).totex.__wrapped__(arg)
+                assert str(arg) == type(arg).__repr__.__wrapped__(arg)
+
+
+def test_lazy_rendering():
+    from rich.console import Console
+
+    hist = steps.explain(parser.parse("x-sqrt(x)/2>=0"))
+    title, body, *_ = hist.__rich__().renderable.renderables
+    # Children are only rendered once the console gets to them
+    assert body.renderable._render is None
+    pieces = list(hist.iter_rich())
+    assert pieces[0] == title
+    assert len(pieces) >= len(hist.children) + 1
+    console = Console(file=io.StringIO(), width=100)
+    for piece in pieces:
+        console.print(piece)
+    assert console.file.getvalue().strip()
+    assert body.renderable._render is None
+    # Collapsed past maxdepth, as they are rendered
+    hist = steps.explain(parser.parse("x-sqrt(x)/2>=0"), maxdepth=0, adaptive=False)
+    assert hist.__rich__().renderable.collapsed
+
+
+def test_step_storage():
+    x = Var("x")
+    args = (x, Const(2))
+    res = x + 2
+    step = steps.Step("ADD", args, res)
+    assert not hasattr(step, "__dict__")
+    # Tracked calls hand over their args tuple: it isn't copied
+    assert step.args is args
+    assert step.result is res
+    assert step == steps.Step("ADD", args, res)
+    assert step != steps.Step("ADD", args, res, "Combine like terms")
+
+
+def test_limit_trace():
+    src = "[x + y + z = 1, x^2 + y^2 + z^2 = 1, x^3 + y^3 + z^3 = 1]"
+    full = parser.parse(src)
+    n = len(list(walk(steps.explain(full, maxdepth=None))))
+    steps._steps.clear()
+    with limit_trace(maxdepth=1):
+        res = parser.parse(src)
+    assert res == full
+    hist = steps.explain(res, maxdepth=None)
+    assert 1 < len(list(walk(hist))) < n
+    steps._steps.clear()
+    with limit_trace(maxsteps=100):
+        res = parser.parse(src)
+    assert res == full
+    assert len(list(walk(steps.explain(res, maxdepth=None)))) < n
+    # maxdepth counts nested scopes, which is the explanation's depth as
+    # long as steps don't explain intermediate results
+    def depth(step):
+        return max((1 + depth(i) for i in step.children), default=0)
+
+    src = "[x + y = 5, x - y = 1]"
+    assert depth(steps.explain(parser.parse(src), maxdepth=None)) > 4
+    for maxdepth in (1, 2):
+        with limit_trace(maxdepth=maxdepth):
+            res = parser.parse(src)
+        assert depth(steps.explain(res, maxdepth=None)) == maxdepth
+    # Calls left out are quiet in their own context only
+    seen = []
+
+    @tracked("probe")
+    def probe():
+        thread = threading.Thread(target=lambda: seen.append(steps.verbose()))
+        thread.start()
+        thread.join()
+        return steps.verbose()
+
+    with limit_trace(maxsteps=0):
+        assert not probe()
+    assert seen == [True]
+    # Recording is back to normal outside
+    assert steps.verbose()
@@ -1,3 +1,4 @@
+import pytest
 from datatypes.expr import *
 from solving.core import solve
 from solving.system import System
@@ -5,6 +6,7 @@ from solving.comparison import Comparison, CompRel
 from solving.solutions import SolutionSet
 
 from parsing import parser
+from utils import limits
 from solving.utils import nth_roots
 
 v = Var("v")
@@ -64,6 +66,116 @@ def test_solve_linear():
     )
 
 
+def test_bareiss():
+    from solving.linear import linear_coefficients, solve_linear
+
+    eqns = parser.parse("[x/2 + y = 3, 3x = 4y + 1, z - x = 0]", False)
+    assert solve_linear(eqns, [x, y, z]) == System(
+        [
+            Comparison(x, Const(13, 5)),
+            Comparison(y, Const(17, 10)),
+            Comparison(z, Const(13, 5)),
+        ]
+    )
+    # Not linear in the target variables
+    eqns = parser.parse("[xy = 1, x + y = 2]", False)
+    assert linear_coefficients(eqns, [x, y]) is None
+    eqns = parser.parse("[x + y = z, x = 2]", False)
+    assert linear_coefficients(eqns, [x, y]) is None
+    # Inconsistent and underdetermined systems
+    assert parser.parse("[x + y = 1, 2x + 2y = 3]") == Comparison(
+        (x, y), SolutionSet(), CompRel.IN
+    )
+    with pytest.raises(ArithmeticError):
+        parser.parse("[x + y + z = 1, 2x + 2y + 2z = 2, x - y = 0]")
+
+    # A larger system: the i-th equation is x₀ + ... + xᵢ = i + 1
+    vals = [Var(f"x{i}") for i in range(40)]
+    eqns = System(Comparison(Add(*vals[: i + 1]), Const(i + 1)) for i in range(40))
+    assert solve_linear(eqns, vals) == System(Comparison(v, Const(1)) for v in vals)
+
+
+def test_solve_parametric():
+    from utils import to_sparse, from_sparse, sparse_gcd, sparse_mul
+    from solving.linear import solve_linear
+
+    a, b, c = Var("a"), Var("b"), Var("c")
+    gens, (p, q) = to_sparse(((a + b) * (a - 2 * c)).expand(), (a * b + b**2).expand())
+    assert from_sparse(sparse_gcd(p, q), gens) == a + b
+
+    eqns = parser.parse("[ax + by = c, x - y = 1]", False)
+    assert eqns.solve_for([x, y]) == System(
+        [
+            Comparison(x, Mul(b + c, Pow(a + b, -1))),
+            Comparison(y, -(a - c) * (a + b) ** -1),
+        ]
+    )
+    res = parser.parse("[ax + y = 2, x + ay = 3]", False).solve_for([x, y])
+    res = {i.left: i.right for i in res}
+    assert res[x] == Mul(2 * a - 3, Pow(a - 1, -1), Pow(a + 1, -1))
+    eqns = parser.parse("[x + y + z = a, x - y = b, x + 2z = c]", False)
+    res = {i.left: i.right for i in eqns.solve_for([x, y, z])}
+    assert res[z] == Mul(Const(-1, 3), a + b - 2 * c, distr_const=False)
+    with pytest.raises(ArithmeticError):
+        parser.parse("[ax + ay = a, bx + by = b]", False).solve_for([x, y])
+    # Leftover equations in the parameters are conditions, not contradictions
+    eqns = parser.parse("[x = 1, x = a]", False)
+    assert eqns.solve_for([x]) == System([Comparison(x, Const(1))])
+    eqns = parser.parse("[ax = 1, x = 2]", False)
+    assert eqns.solve_for([x]) == System([Comparison(x, Const(2))])
+    assert solve_linear(parser.parse("[x + a = 1, x + a = 2]", False), [x]) == System()
+
+
+def test_resultants():
+    from utils import to_sparse, from_sparse
+    from solving.resultant import resultant, compute_resultants
+
+    gens, (p, q) = to_sparse((x**2 + y**2 - 5).expand(), x - y - 1)
+    assert from_sparse(resultant(p, q, 0), gens) == 2 * y**2 + 2 * y - 4
+    eqns = parser.parse("[xy = z, x + y = -7, x + z = -3y - 1]", False)
+    assert eqns.solve_for([x, y, z]) == eqns.solve_for([x, y, z], resultants=False)
+    # No pivot linear in x or y: left to the Groebner basis
+    eqns = parser.parse("[x^4 + y^2 = 5, yx^3 = 2]", False)
+    assert compute_resultants(eqns, [x, y]) is None
+    # Complex coefficients: left to the Groebner basis too
+    eqns = parser.parse("[x + i y = 1, x - y = 0]", False)
+    assert compute_resultants(eqns, [x, y]) is None
+    assert str(parser.parse("[x + i y = 1, x - y = 0]")) == (
+        "(x, y) = ((1-i)/2, (1-i)/2)"
+    )
+
+
+def test_triangular():
+    from solving.utils import triangular
+
+    eqns = parser.parse("[x^2 = y, y = 4, x + y = 2]", False)
+    assert [(v, set(i)) for v, i in triangular(eqns, [x, y])] == [
+        (y, {Comparison(y, Const(4))}),
+        (x, {Comparison(x**2, y), Comparison(x + y, Const(2))}),
+    ]
+    with pytest.raises(ArithmeticError):
+        triangular(parser.parse("[y = 4]", False), [x, y])
+    # One branch per root of x, y is solved once in each
+    res = parser.parse("[x^2 = y, y^2 = 16]", False).solve_for([x, y])
+    assert res == System(
+        [
+            System([Comparison(x, Const(2)), Comparison(y, Const(4))]),
+            System([Comparison(x, Const(-2)), Comparison(y, Const(4))]),
+        ]
+    )
+    # Variables are matched by name, not as substrings: x1 doesn't contain x
+    x1 = Var("x1")
+    eqns = [Comparison(x + x1, Const(3)), Comparison(x1**2, Const(4))]
+    assert [(v, set(i)) for v, i in triangular(eqns, [x, x1])] == [
+        (x1, {eqns[1]}),
+        (x, {eqns[0]}),
+    ]
+    eqns = System([Comparison(x + x1, Const(3)), Comparison(x**2 - x1, Const(3))])
+    assert solve(eqns) == Comparison(
+        (x, x1), SolutionSet({(-3, 6), (2, 1)}), CompRel.IN
+    )
+
+
 def test_solve_quadratic_linear():
     assert parser.parse("[v + w = 10, vw = 21]") == Comparison(
         (v, w), SolutionSet({(3, 7), (7, 3)}), CompRel.IN
@@ -161,6 +273,25 @@ def test_solve_high_degree():
     }
 
 
+def test_homotopy():
+    from solving.homotopy import homotopy_solve
+
+    src = "[x^4 + y^2 = 5, yx^3 = 2]"
+    res = parser.parse(f"approx({src})")
+    assert res.left == (x, y) and len(res.right) == 10
+    assert getvar(res, y, 4) == getvar(parser.parse(src), y, 4)
+    # Double roots
+    res = parser.parse(
+        "approx([x + y + z = 1, x^2 + y^2 + z^2 = 1, x^3 + y^3 + z^3 = 1])"
+    )
+    one, zero = Float(1.0), Float(0.0)
+    assert res.right == {(one, zero, zero), (zero, one, zero), (zero, zero, one)}
+    # Inconsistent: every path diverges
+    eqns = parser.parse("[x^2 + y^2 = 1, x^2 + y^2 = 2]", False)
+    assert homotopy_solve(eqns, [x, y]) == set()
+    assert homotopy_solve(parser.parse("[x^2 + y^2 = 1]", False), [x, y]) is None
+
+
 def round_(n, ndigits):
     if n.imag:
         return complex(round(n.real, ndigits), round(n.imag, ndigits))
@@ -173,3 +304,44 @@ def getvar(s, v, ndigits=None):
     if ndigits is not None:
         return {round_(i.approx(), ndigits) for i in res}
     return res
+
+
+def test_cancellation():
+    eqns = parser.parse("[x^2 + y^2 = 25, x^2 - 9 = y^2 - 2]", False)
+    with pytest.raises(limits.Timeout):
+        with limits.deadline(0):
+            eqns.solve_for([x, y])
+    with pytest.raises(limits.Cancelled):
+        with limits.cancellable() as token:
+            token.cancel()
+            parser.parse("x^3 - 2x + 1 = 0")
+    # Nested tokens inherit their parent's cancellation
+    with pytest.raises(limits.Cancelled):
+        with limits.cancellable() as token, limits.deadline(60):
+            token.cancel()
+            limits.checkpoint()
+    with limits.deadline(60):
+        assert parser.parse("[x + y = 5, 3x = 4y + 1]") == Comparison((x, y), (3, 2))
+
+
+def test_budgets():
+    with pytest.raises(limits.BudgetExceeded):
+        with limits.budget(max_terms=1000):
+            ((x + y + z + 1) ** 200).expand()
+    with pytest.raises(limits.BudgetExceeded):
+        with limits.budget(max_coef_bits=64):
+            Const(3) ** 100 + x
+    with pytest.raises(limits.BudgetExceeded):
+        with limits.budget(max_nodes=20):
+            ((x + y + 1) ** 4).expand()
+    with limits.budget(max_terms=100, max_coef_bits=64, max_nodes=200):
+        assert ((x + 1) ** 3).expand() == x**3 + 3 * x**2 + 3 * x + 1
+    # Like terms merge: 101 terms, not the 1326 products
+    with limits.budget(max_terms=1000):
+        assert len(((x**2 + x + 1) ** 50).expand().args) == 101
+    # Nodes built before the budget, and cached, still count
+    terms = [Var(f"t{i}") for i in range(30)]
+    Add(*terms)
+    with pytest.raises(limits.BudgetExceeded):
+        with limits.budget(max_terms=10):
+            Add(*terms)
@@ -4,3 +4,5 @@ from .constants import *
 from .numeric import *
 from .polynomial import *
 from .factoring import *
+from .cache import *
+from .sparse import *
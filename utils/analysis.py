@@ -56,9 +56,22 @@ def lru_cache(func: Callable[P, R]) -> Callable[P, R]:
     return func
 
 
+@lru_cache
+def free_vars(node: Expr) -> frozenset[Var]:
+    """All the variables of an expression, at any depth"""
+    match node.__class__.__name__:
+        case "Var":
+            return frozenset((node,))
+        case "Pow":
+            return free_vars(node.base) | free_vars(node.exp)
+        case "Add" | "Mul":
+            return frozenset().union(*map(free_vars, node.args))
+    return frozenset()
+
+
 def clear_all_caches():
     for f in CACHED_FUNCS:
         f.cache_clear()
 
 
-__all__ = ["mult_key", "get_vars", "lru_cache", "clear_all_caches"]
+__all__ = ["mult_key", "get_vars", "free_vars", "lru_cache", "clear_all_caches"]
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, ParamSpec, TypeVar
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+
+from . import steps
+from .constants import VERSION
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def serialize(value: Any) -> str:
+    """
+    Canonical string form of an engine value, stable across processes.
+    Unlike repr(), it is lossless (no rounding of Floats, no pretty printing)
+    and does not depend on set iteration order or hash seeds.
+    """
+    match value.__class__.__name__:
+        case "Var":
+            return str(value)
+        case "Const":
+            return repr(value)
+        case "Float":
+            return "F" + repr(value._val)
+        case "Pow":
+            return f"Pow({serialize(value.base)},{serialize(value.exp)})"
+        case "Add" | "Mul":
+            args = sorted(map(serialize, value.args))
+            return value.__class__.__name__ + ",".join(args).join("()")
+        case "Comparison":
+            left, right = serialize(value.left), serialize(value.right)
+            return f"Comparison({left},{right},{value.rel.name})"
+    if isinstance(value, (set, frozenset)):
+        items = sorted(map(serialize, value))
+        return value.__class__.__name__ + ",".join(items).join("{}")
+    if isinstance(value, (list, tuple)):
+        return ",".join(map(serialize, value)).join("[]")
+    if isinstance(value, dict):
+        return serialize(sorted((serialize(k), serialize(v)) for k, v in value.items()))
+    return repr(value)
+
+
+class PersistentCache:
+    """
+    SQLite backed key-value store of pickled results.
+    Entries are evicted least-recently-used first once `max_entries` or
+    `max_bytes` is exceeded. The whole store is dropped when it was written
+    by a different engine `version`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 << 20,
+        version: str = VERSION,
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.version = version
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, op TEXT, value BLOB, size INTEGER, used INTEGER)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS entries_used ON entries (used)"
+            )
+            row = self._db.execute(
+                "SELECT value FROM meta WHERE name = 'version'"
+            ).fetchone()
+            if row is None or row[0] != version:
+                self._db.execute("DELETE FROM entries")
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,)
+                )
+
+    @staticmethod
+    def key(op: str, value: Any) -> str:
+        return hashlib.sha256(f"{op}:{serialize(value)}".encode()).hexdigest()
+
+    def get(self, op: str, value: Any) -> tuple[bool, Any]:
+        key = self.key(op, value)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            try:
+                res = pickle.loads(row[0])
+            except Exception:
+                with self._db:
+                    self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return False, None
+            with self._db:
+                self._db.execute(
+                    "UPDATE entries SET used = ? WHERE key = ?", (time.time_ns(), key)
+                )
+        return True, res
+
+    def put(self, op: str, value: Any, result: Any) -> None:
+        try:
+            data = pickle.dumps(result)
+        except Exception:
+            return
+        if len(data) > self.max_bytes:
+            return
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (self.key(op, value), op, data, len(data), time.time_ns()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        count, size = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        for key, n in self._db.execute(
+            "SELECT key, size FROM entries ORDER BY used"
+        ).fetchall():
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            count -= 1
+            size -= n
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def enable_cache(path: str, **kwargs) -> PersistentCache:
+    """Opt in to persisting results of expensive operations at `path`"""
+    global _cache
+    disable_cache()
+    _cache = PersistentCache(path, **kwargs)
+    return _cache
+
+
+def disable_cache() -> None:
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+
+
+def get_cache() -> PersistentCache | None:
+    return _cache
+
+
+def persistent(op: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Look up the results of `op` in the persistent cache (when enabled).
+    Only the outermost cached call consults the store, and verbose calls
+    always recompute, since their steps are not persisted.
+    """
+
+    def wrapper(func: Callable[P, R]) -> Callable[P, R]:
+        @wraps(func)
+        def inner(*args: P.args, **kwargs: P.kwargs) -> R:
+            cache = _cache
+            if cache is None or steps.verbose() or _active.get():
+                return func(*args, **kwargs)
+            key = (args, kwargs)
+            try:
+                hit, res = cache.get(op, key)
+            except sqlite3.Error:
+                return func(*args, **kwargs)
+            if hit:
+                return res
+            token = _active.set(True)
+            try:
+                res = func(*args, **kwargs)
+            finally:
+                _active.reset(token)
+            try:
+                cache.put(op, key, res)
+            except sqlite3.Error:
+                pass
+            return res
+
+        return inner
+
+    return wrapper
+
+
+_cache: PersistentCache | None = None
+_active = ContextVar("_active", default=False)
+
+__all__ = [
+    "serialize",
+    "PersistentCache",
+    "enable_cache",
+    "disable_cache",
+    "get_cache",
+    "persistent",
+]
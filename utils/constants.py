@@ -1,3 +1,6 @@
+# Bump whenever results may change: invalidates persisted caches
+VERSION = "1.0.0"
+
 SYMBOLS = {
     "COMMA": ",",
     "EQ": "=",
@@ -10,9 +10,12 @@ from operator import itemgetter
 
 from . import expr
 from . import steps
+from . import limits
+from . import profile
 
 from .numeric import primes
 from .analysis import mult_key, get_vars, lru_cache
+from .cache import persistent
 from .polynomial import (
     is_polynomial,
     degree,
@@ -242,6 +245,7 @@ def rational_roots(coeffs: tuple[Expr]) -> tuple[tuple[Expr]]:
 
 
 @steps.tracked()
+@persistent("factor")
 def factor(value: Expr) -> Expr:
     if value.__class__ is expr.Mul:
         return reduce(expr.Expr.__mul__, map(factor, value.args))
@@ -291,6 +295,7 @@ def factor(value: Expr) -> Expr:
                     continue
                 tree[k] += v
         for v in sorted(vars, key=tree.get):
+            limits.checkpoint("factoring.pick_best")
             res = dfs(extract(c, v), vars - {v})
             if not res or any(i.__class__ is expr.Add for j in res for i in j):
                 continue
@@ -307,6 +312,7 @@ def factor(value: Expr) -> Expr:
     ):
         if coeffs in seen:
             return seen[coeffs]
+        limits.checkpoint("factoring.dfs")
         temp = coeffs
         changed = False
         if vars:
@@ -356,6 +362,11 @@ def factor(value: Expr) -> Expr:
     )
 
 
+# Tracked calls through .func: patching it reaches every reference
+profile.instrument(gcd, "func", "gcd")
+profile.instrument(lcm, "func", "lcm")
+profile.instrument(factor, "func", "factor")
+
 __all__ = [
     "flatten_factors",
     "divisors",
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator
+import time
+
+from .analysis import lru_cache
+from . import profile
+
+if TYPE_CHECKING:
+    from datatypes.base import Expr
+    from datatypes.const import Const
+
+
+class Cancelled(BaseException):
+    """
+    Raised at a checkpoint once the running computation was cancelled.
+    Like asyncio.CancelledError, it is not an Exception, so the solver's
+    `except Exception` fallbacks don't mistake it for a failed attempt.
+    """
+
+
+class Timeout(Cancelled):
+    """Raised at a checkpoint once the computation ran past its deadline"""
+
+
+class BudgetExceeded(Cancelled):
+    """Raised when an expression grows past the active Budget"""
+
+
+class CancelToken:
+    """
+    Cooperative cancellation flag with an optional deadline.
+    Tokens nest: a token is also cancelled when its parent is.
+    """
+
+    __slots__ = ("_cancelled", "deadline", "parent")
+
+    def __init__(self, timeout: float | None = None, parent: CancelToken = None):
+        self._cancelled = False
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.parent = parent
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise Cancelled("operation was cancelled")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise Timeout("operation timed out")
+        if self.parent is not None:
+            self.parent.check()
+
+
+@contextmanager
+def cancellable(
+    token: CancelToken | None = None, timeout: float | None = None
+) -> Iterator[CancelToken]:
+    """Run the enclosed computation under `token` (a fresh one by default)"""
+    if token is None:
+        token = CancelToken(timeout, _token.get())
+    ctx = _token.set(token)
+    try:
+        yield token
+    finally:
+        _token.reset(ctx)
+
+
+def deadline(seconds: float) -> Iterator[CancelToken]:
+    """Raise Timeout at the first checkpoint reached after `seconds`"""
+    return cancellable(timeout=seconds)
+
+
+def checkpoint(label: str = None) -> None:
+    """
+    Cancellation point for long-running loops.
+    `label` names the loop for instrumentation, as "module.function", so
+    profile counts the iterations of each loop separately.
+    """
+    if profile._active:
+        profile.count(label)
+    if (token := _token.get()) is not None:
+        token.check()
+
+
+@dataclass(frozen=True, slots=True)
+class Budget:
+    """Size limits for the expressions built while the budget is active"""
+
+    max_terms: int | None = None
+    max_coef_bits: int | None = None
+    max_nodes: int | None = None
+
+
+@contextmanager
+def budget(
+    max_terms: int | None = None,
+    max_coef_bits: int | None = None,
+    max_nodes: int | None = None,
+) -> Iterator[Budget]:
+    """Raise BudgetExceeded when a constructed expression exceeds the limits"""
+    ctx = _budget.set(Budget(max_terms, max_coef_bits, max_nodes))
+    try:
+        yield _budget.get()
+    finally:
+        _budget.reset(ctx)
+
+
+def bit_length(n) -> int:
+    if n.__class__ is not int:
+        return max(abs(n.real).bit_length(), abs(n.imag).bit_length())
+    return abs(n).bit_length()
+
+
+@lru_cache
+def node_count(node: Expr) -> int:
+    match node.__class__.__name__:
+        case "Pow":
+            return 1 + node_count(node.base) + node_count(node.exp)
+        case "Add" | "Mul":
+            return 1 + sum(map(node_count, node.args))
+    return 1
+
+
+def check_terms(n: int) -> None:
+    """Fail early when a result is about to have `n` terms"""
+    b = _budget.get()
+    if b is not None and b.max_terms is not None and n > b.max_terms:
+        raise BudgetExceeded(f"{n} terms exceed the budget of {b.max_terms}")
+
+
+def check_bits(n: int) -> None:
+    """Fail early when a coefficient is about to be `n` bits long"""
+    b = _budget.get()
+    if b is not None and b.max_coef_bits is not None and n > b.max_coef_bits:
+        raise BudgetExceeded(
+            f"{n}-bit coefficient exceeds the budget of {b.max_coef_bits} bits"
+        )
+
+
+def check_power(base: Const, exp: int) -> None:
+    """Fail before computing `base ** exp` if the result would be too long"""
+    b = _budget.get()
+    if b is None or b.max_coef_bits is None:
+        return
+    n = max(bit_length(base.numerator), bit_length(base.denominator))
+    check_bits(n * abs(exp))
+
+
+def check_size(node: Expr) -> None:
+    """Validate a Collection, new or cached, against the active budget"""
+    if (b := _budget.get()) is None:
+        return
+    if node.__class__.__name__ == "Add":
+        check_terms(len(node.args))
+    if b.max_coef_bits is not None:
+        for i in node.args:
+            if i.__class__.__name__ == "Const":
+                check_bits(max(bit_length(i.numerator), bit_length(i.denominator)))
+    if b.max_nodes is not None and (n := node_count(node)) > b.max_nodes:
+        raise BudgetExceeded(f"{n} nodes exceed the budget of {b.max_nodes}")
+
+
+_token: ContextVar[CancelToken | None] = ContextVar("_token", default=None)
+_budget: ContextVar[Budget | None] = ContextVar("_budget", default=None)
+
+__all__ = [
+    "Cancelled",
+    "Timeout",
+    "BudgetExceeded",
+    "CancelToken",
+    "Budget",
+    "cancellable",
+    "deadline",
+    "checkpoint",
+    "budget",
+    "check_terms",
+    "check_bits",
+    "check_power",
+    "check_size",
+    "node_count",
+]
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Generator
 
-from math import gcd
+from math import gcd, comb
 from collections import defaultdict
 from . import expr
 
@@ -79,4 +79,18 @@ def simplify_radical(n: Const, root: int = 2) -> tuple[Const]:
     return c, v, expr.Const(1, root // cd)
 
 
-__all__ = ["primes", "simplify_radical"]
+def multinomial(n: int, k: int) -> Generator[tuple[tuple[int], int], None, None]:
+    """
+    Terms of (a₁ + a₂ + ... + aₖ)ⁿ as (exponents, coefficient) pairs,
+    where the coefficient is n! / (e₁! e₂! ... eₖ!)
+    """
+    if k == 1:
+        yield (n,), 1
+        return
+    for e in range(n, -1, -1):
+        c = comb(n, e)
+        for exps, r in multinomial(n - e, k - 1):
+            yield (e, *exps), c * r
+
+
+__all__ = ["primes", "simplify_radical", "multinomial"]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Iterator, ParamSpec, TypeVar
+import threading
+import time
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class Profile:
+    """
+    Call counts and cumulative (inclusive) times per operation label.
+    Recursive calls are counted, but only the outermost one is timed.
+    """
+
+    __slots__ = ("counts", "times", "depth", "start", "elapsed")
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+        self.times = defaultdict(float)
+        self.depth = defaultdict(int)
+        self.start = time.perf_counter()
+        self.elapsed = None
+
+    def report(self) -> dict:
+        """
+        {"elapsed": seconds, "operations": {label: {"calls": n, "time": s}}},
+        slowest first. Loop counters from limits.checkpoint have no time.
+        """
+        elapsed = self.elapsed
+        if elapsed is None:
+            elapsed = time.perf_counter() - self.start
+        ops = {}
+        for label in sorted(
+            self.counts, key=lambda k: (-self.times.get(k, -1), -self.counts[k])
+        ):
+            ops[label] = {"calls": self.counts[label]}
+            if label in self.times:
+                ops[label]["time"] = self.times[label]
+        return {"elapsed": elapsed, "operations": ops}
+
+    def __str__(self) -> str:
+        report = self.report()
+        lines = [f"{'operation':<28} {'calls':>10} {'time (ms)':>12}"]
+        for label, v in report["operations"].items():
+            t = f"{v['time'] * 1e3:12.3f}" if "time" in v else f"{'':>12}"
+            lines.append(f"{label:<28} {v['calls']:>10} {t}")
+        lines.append(f"{'total':<28} {'':>10} {report['elapsed'] * 1e3:12.3f}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """Count and time the instrumented operations of the enclosed computation"""
+    global _active
+    prof = Profile()
+    ctx = _profile.set(prof)
+    with _lock:
+        if not _active:
+            _install()
+        _active += 1
+    try:
+        yield prof
+    finally:
+        with _lock:
+            _active -= 1
+            if not _active:
+                _uninstall()
+        _profile.reset(ctx)
+        prof.elapsed = time.perf_counter() - prof.start
+
+
+def count(label: str) -> None:
+    """Count one occurence of `label`"""
+    if _active and (prof := _profile.get()) is not None:
+        prof.counts[label] += 1
+
+
+def instrument(owner: object, attr: str, label: str | None = None) -> None:
+    """
+    Count and time calls to `owner.attr` while a profile is active. The
+    wrapper is only installed then, so instrumentation is free otherwise.
+    """
+    _hooks.append((owner, attr, label or attr))
+
+
+def _timed(func: Callable[P, R], label: str) -> Callable[P, R]:
+    @wraps(func)
+    def inner(*args: P.args, **kwargs: P.kwargs) -> R:
+        if (prof := _profile.get()) is None:
+            return func(*args, **kwargs)
+        prof.counts[label] += 1
+        if prof.depth[label]:
+            return func(*args, **kwargs)
+        prof.depth[label] += 1
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            prof.times[label] += time.perf_counter() - start
+            prof.depth[label] -= 1
+
+    return inner
+
+
+def _install() -> None:
+    for owner, attr, label in _hooks:
+        orig = vars(owner)[attr]
+        if isinstance(orig, (classmethod, staticmethod)):
+            new = type(orig)(_timed(orig.__func__, label))
+        else:
+            new = _timed(orig, label)
+        _installed.append((owner, attr, orig))
+        setattr(owner, attr, new)
+
+
+def _uninstall() -> None:
+    while _installed:
+        owner, attr, orig = _installed.pop()
+        setattr(owner, attr, orig)
+
+
+# Number of profiles active in any context: checkpoints only read this
+_active: int = 0
+_lock = threading.Lock()
+_hooks: list[tuple[object, str, str]] = []
+_installed: list[tuple[object, str, object]] = []
+_profile: ContextVar[Profile | None] = ContextVar("_profile", default=None)
+
+__all__ = ["Profile", "profile", "count", "instrument"]
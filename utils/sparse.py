@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, Iterable
+import math
+
+from . import expr
+from . import limits
+
+if TYPE_CHECKING:
+    from datatypes.base import Expr
+    from datatypes.expr import *
+
+# {(e₁, e₂, ...): coefficient} over a shared tuple of generators (x₁, x₂, ...)
+Sparse = dict[tuple[int, ...], "Number"]
+
+
+def monomials(node: Expr) -> list[tuple[Number, dict[Var, int]]] | None:
+    """
+    Split a polynomial with numeric coefficients into (coefficient, {var: exp})
+    pairs, one per term. Returns None for anything else.
+    """
+    if isinstance(node, int):
+        node = expr.Const(node)
+    res = []
+    for term in expr.Add.flatten(node):
+        coef, val = term.canonical()
+        exps = {}
+        if val is not None:
+            for i in expr.Mul.flatten(val, 0):
+                if i.__class__ is expr.Var:
+                    exps[i] = 1
+                elif (
+                    i.__class__ is expr.Pow
+                    and i.base.__class__ is expr.Var
+                    and i.exp.__class__ is expr.Const
+                    and i.exp.denominator == 1
+                    and not i.exp.numerator.imag
+                    and i.exp.numerator > 0
+                ):
+                    exps[i.base] = i.exp.numerator
+                else:
+                    return
+        res.append((coef, exps))
+    return res
+
+
+def to_sparse(*nodes: Expr) -> tuple[tuple[Var, ...], list[Sparse]] | None:
+    """Convert polynomials to sparse form over their common generators"""
+    terms = []
+    for node in nodes:
+        if (t := monomials(node)) is None:
+            return
+        terms.append(t)
+    gens = tuple(sorted({v for t in terms for _, exps in t for v in exps}))
+    polys = []
+    for t in terms:
+        p = {}
+        for coef, exps in t:
+            p[tuple(exps.get(v, 0) for v in gens)] = coef
+        polys.append(p)
+    return gens, polys
+
+
+def from_sparse(poly: Sparse, gens: Iterable[Var]) -> Expr:
+    """Build the Add of a sparse polynomial without re-merging its terms"""
+    gens = tuple(gens)
+    terms = []
+    for exps, coef in poly.items():
+        if coef == 0:
+            continue
+        factors = [expr.Pow(v, expr.Const(e)) for v, e in zip(gens, exps) if e]
+        if coef != 1 or not factors:
+            factors.append(coef)
+        if len(factors) == 1:
+            terms.append(factors[0])
+        else:
+            terms.append(
+                expr.Mul.from_terms(expr.Mul.sort_terms(factors), modify=False)
+            )
+    if not terms:
+        return expr.Const(0)
+    if len(terms) == 1:
+        return terms[0]
+    return expr.Add.from_terms(expr.Add.sort_terms(terms), modify=False)
+
+
+def sparse_mul(p: Sparse, q: Sparse) -> Sparse:
+    res = defaultdict(expr.Const)
+    for ea, ca in p.items():
+        for eb, cb in q.items():
+            e = tuple(i + j for i, j in zip(ea, eb))
+            c = ca.mul(cb)
+            # Mul.merge drops unit coefficients, even inexact ones
+            res[e] = res[e].add(c if c != 1 else expr.Const(1))
+    return {e: c for e, c in res.items() if c}
+
+
+def sparse_add(p: Sparse, q: Sparse) -> Sparse:
+    res = dict(p)
+    for e, c in q.items():
+        if (v := res.pop(e, None)) is not None:
+            c = v.add(c)
+        if c:
+            res[e] = c
+    return res
+
+
+def sparse_sub(p: Sparse, q: Sparse) -> Sparse:
+    return sparse_add(p, {e: -c for e, c in q.items()})
+
+
+def sparse_shift(p: Sparse, c: Number, e: tuple[int, ...]) -> Sparse:
+    """c·xᵉ·p"""
+    return {tuple(i + j for i, j in zip(k, e)): v.mul(c) for k, v in p.items()}
+
+
+def sparse_div(p: Sparse, q: Sparse) -> Sparse | None:
+    """Exact quotient p / q, or None when q does not divide p"""
+    lq = max(q)
+    r, quo = p, {}
+    while r:
+        lr = max(r)
+        e = tuple(i - j for i, j in zip(lr, lq))
+        if any(i < 0 for i in e):
+            return
+        c = r[lr].div(q[lq])
+        quo[e] = c
+        r = sparse_sub(r, sparse_shift(q, c, e))
+    return quo
+
+
+def lead(p: Sparse, k: int) -> tuple[int, Sparse]:
+    """Degree of p in the k-th generator, and the coefficient at that degree"""
+    d = max(e[k] for e in p)
+    return d, {e[:k] + (0,) + e[k + 1 :]: c for e, c in p.items() if e[k] == d}
+
+
+def sparse_prem(p: Sparse, q: Sparse, k: int, full: bool = False) -> Sparse:
+    """
+    Sparse pseudo-remainder of p by q in the k-th generator. With `full`,
+    it is scaled to exactly lc(q)^(deg p - deg q + 1)·p mod q.
+    """
+    dq, lc = lead(q, k)
+    one = expr.Const(1)
+    r = p
+    e = lead(p, k)[0] - dq + 1 if p else 0
+    while r and (lr := lead(r, k))[0] >= dq:
+        d, c = lr
+        shift = tuple(d - dq if i == k else 0 for i in range(len(max(q))))
+        r = sparse_sub(sparse_mul(lc, r), sparse_mul(c, sparse_shift(q, one, shift)))
+        e -= 1
+    if full and r:
+        for _ in range(e):
+            r = sparse_mul(lc, r)
+    return r
+
+
+def primitive(p: Sparse) -> Sparse:
+    """Scale p to coprime integer coefficients"""
+    den = math.lcm(*(c.denominator for c in p.values()))
+    num = math.gcd(*(c.numerator * (den // c.denominator) for c in p.values()))
+    if den == num == 1:
+        return p
+    k = expr.Const(den, num)
+    return {e: c.mul(k) for e, c in p.items()}
+
+
+def monic(p: Sparse) -> Sparse:
+    c = p[max(p)]
+    return {e: v.div(c) for e, v in p.items()}
+
+
+def content(p: Sparse, k: int) -> Sparse:
+    """GCD of the coefficients of p as a polynomial in the k-th generator"""
+    res = None
+    for c in _coefficients(p, k):
+        res = c if res is None else sparse_gcd(res, c, k + 1)
+        if len(res) == 1 and not any(max(res)):
+            break
+    return monic(res)
+
+
+def _coefficients(p: Sparse, k: int) -> Iterable[Sparse]:
+    res = defaultdict(dict)
+    for e, c in p.items():
+        res[e[k]][e[:k] + (0,) + e[k + 1 :]] = c
+    return res.values()
+
+
+def sparse_gcd(p: Sparse, q: Sparse, k: int = 0) -> Sparse:
+    """
+    Monic GCD of multivariate polynomials: recursive primitive PRS in each
+    generator from the k-th on, with the contents handled one level down.
+    """
+    if not p or not q:
+        return monic(p or q) if p or q else {}
+    n = len(next(iter(p)))
+    if k == n:
+        return {(0,) * n: expr.Const(1)}
+    cp, cq = content(p, k), content(q, k)
+    c = sparse_gcd(cp, cq, k + 1)
+    a, b = primitive(sparse_div(p, cp)), primitive(sparse_div(q, cq))
+    if lead(a, k)[0] < lead(b, k)[0]:
+        a, b = b, a
+    while lead(b, k)[0]:
+        limits.checkpoint("sparse.gcd")
+        if not (r := sparse_prem(a, b, k)):
+            break
+        a, b = b, primitive(sparse_div(r, content(r, k)))
+    else:
+        return c
+    return monic(sparse_mul(c, b))
+
+
+def sparse_multiply(a: Expr, b: Expr) -> Expr | None:
+    """
+    Distribute `a` * `b` through their exponent vectors when both are
+    polynomials with numeric coefficients. Returns None otherwise.
+    """
+    if (res := to_sparse(a, b)) is None:
+        return
+    gens, (p, q) = res
+    return from_sparse(sparse_mul(p, q), gens)
+
+
+__all__ = [
+    "to_sparse",
+    "from_sparse",
+    "sparse_mul",
+    "sparse_add",
+    "sparse_sub",
+    "sparse_div",
+    "sparse_prem",
+    "sparse_gcd",
+    "sparse_multiply",
+]
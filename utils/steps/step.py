@@ -1,28 +1,55 @@
 from __future__ import annotations
 
-from typing import Any, Iterator
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
 
+from contextvars import ContextVar
 from copy import copy
-from dataclasses import dataclass
 from itertools import chain
 from enum import Enum
+import sys
 import weakref
 
-from rich.text import Text
-from rich.console import Group
-from rich.panel import Panel
-from rich.console import Group, Console
-from rich.padding import Padding
-
 
+from ..analysis import lru_cache
 from ..constants import SYMBOLS
 from ..print_ import superscript, colorize_ansi, print_system
 
+if TYPE_CHECKING:
+    from rich.console import Group
+    from rich.text import Text
+    from rich.panel import Panel
+
 
 def tex(value):
     return getattr(value, "totex", lambda: str(value))()
 
 
+@lru_cache
+def ansi_markup(text: str) -> str:
+    """Rich markup of text colored with ANSI escapes"""
+    from rich.text import Text
+
+    return Text.from_ansi(text).markup
+
+
+def header_markup(step: Step) -> str:
+    """
+    Markup of the step's header, converted in pieces so the expressions
+    repeated across a trace are converted once
+    """
+    res = ansi_markup(str(step))
+    if step.type is OPSpecials.STATE:
+        return res
+    return res + " --> " + ansi_markup(str(step.result))
+
+
+@lru_cache
+def normalize_markup(text: str) -> str:
+    from rich.text import Text
+
+    return Text.from_markup(text).markup
+
+
 _del_seen = set()
 
 
@@ -48,14 +75,18 @@ def delete_unused(idx):
     # step = _steps.pop(id(step.result))
 
 
-def ref(value, force_keep=False, deletter_arg=None):
-    if force_keep:
-        return lambda: value
-    try:
-        weakref.finalize(value, delete_unused, id(value))
-        return weakref.ref(value)
-    except TypeError:
-        return lambda: value
+def ref(value) -> weakref.KeyedRef:
+    """
+    Weak reference to a result, keyed by its id: a callback on the reference
+    drops the result's steps once it dies, without a finalizer per result
+    """
+    return weakref.KeyedRef(value, _collect, id(value))
+
+
+def _collect(ref: weakref.KeyedRef, finalizing=sys.is_finalizing) -> None:
+    # Results die while the interpreter tears the modules down too
+    if not finalizing():
+        delete_unused(ref.key)
 
 
 class OPArithmeticType(Enum):
@@ -127,6 +158,7 @@ class OPSpecials(Enum):
     SOLVE = 3
     HIDDEN = 4
     SYS = 5
+    ELIMINATE = 6
 
     def tostr(self, *args) -> str:
         if self is OPSpecials.HIDDEN:
@@ -146,6 +178,8 @@ class OPSpecials(Enum):
             )
         if self is OPSpecials.SYS:
             return print_system(args)
+        if self is OPSpecials.ELIMINATE:
+            return "Eliminate " + ", ".join(map(str, args[1:]))
 
     def totex(self, *args) -> str:
         if self is OPSpecials.HIDDEN:
@@ -160,17 +194,33 @@ class OPSpecials(Enum):
             return "verify" + ",".join(map(tex, args)).join("()")
         if self is OPSpecials.SOLVE:
             return "Solve for " + str(args[1])
+        if self is OPSpecials.ELIMINATE:
+            return "\\text{Eliminate }" + ",".join(map(tex, args[1:]))
         return "Substitue {0} with {1}".format(tex(args[0]), tex(args[1]))
 
 
-@dataclass
 class Step:
+    """
+    A recorded operation: `type` applied to `args` gave `result`. The
+    result is held weakly (when it can be), so steps go away with it
+    """
+
+    __slots__ = (
+        "type",
+        "args",
+        "reason",
+        "children",
+        "changed",
+        "_ref",
+        "_value",
+        "_fold",
+        "__weakref__",
+    )
     type: str | OPArithmeticType | OPBinaryType | OPSpecials
     args: tuple
-    result: Any = None
-    reason: str = ""
-    children: list[Step] = None
-    changed: bool = True
+    reason: str
+    children: list[Step]
+    changed: bool
     _options = dict(
         chain(
             OPArithmeticType.__members__.items(),
@@ -195,33 +245,94 @@ class Step:
             self.type = id
         if not hasattr(args, "__iter__"):
             args = (args,)
-        self.args = list(args)
-        self._result = ref(result, force_keep, self)
+        # Tracked calls pass their own args tuple, which this shares
+        self.args = tuple(args)
+        self._ref = self._value = None
+        if force_keep:
+            self._value = result
+        else:
+            try:
+                self._ref = ref(result)
+            except TypeError:
+                self._value = result
         self.children = children or []
         self.reason = reason
         self.changed = changed
-        self._args = tuple(self.args)
-        self._collapsed = False
+        self._fold = None
 
     def __copy__(self):
         return Step(
             self.type,
-            self.args.copy(),
+            self.args,
             self.result,
             self.reason,
             self.children.copy(),
             self.changed,
         )
 
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not Step:
+            return NotImplemented
+        return (
+            self.type,
+            self.args,
+            self.result,
+            self.reason,
+            self.children,
+            self.changed,
+        ) == (
+            other.type,
+            other.args,
+            other.result,
+            other.reason,
+            other.children,
+            other.changed,
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Step(type={self.type!r}, args={self.args!r}, result={self.result!r},"
+            f" reason={self.reason!r}, children={self.children!r},"
+            f" changed={self.changed!r})"
+        )
+
+    def __getstate__(self) -> tuple:
+        # The weak reference to the result can't be pickled: hold it instead
+        return (
+            self.type,
+            self.args,
+            self.result,
+            self.reason,
+            self.children,
+            self.changed,
+            self._fold,
+        )
+
+    def __setstate__(self, state: tuple) -> None:
+        (
+            self.type,
+            self.args,
+            self._value,
+            self.reason,
+            self.children,
+            self.changed,
+            self._fold,
+        ) = state
+        self._ref = None
+
     @property
     def result(self):
-        return self._result()
+        if self._ref is None:
+            return self._value
+        return self._ref()
 
     def force_keep(self):
         if not self.changed and not self.children:
             return
-        res = self.result
-        self._result = lambda: res
+        self._value = self.result
+        self._ref = None
 
     def __str__(self) -> str:
         if type(self.type) is not str:
@@ -250,64 +361,21 @@ class Step:
         return self.totex() + "\\longrightarrow " + tex(self.result)
 
     def __rich__(self) -> Text | Panel:
-        PANEL_COLORS = ["#F0E68C", "#9370DB", "#87CEFA"]
-
-        def rich(step: Step, depth, index):
-            idx = str(index) + ". " if index else ""
-            lpad = bool(depth) + 1
-            label = step.reason + ": " if step.reason else ""
-            if not step.children and not isinstance(step.result, Exception):
-                return Text.from_ansi(f"{idx}{label}{step.header()}").markup
-            p = len(step.children) > 1
-            lpad *= not len(step.children) or not bool(index) or not depth
-            org_title = title = "[bold]" + idx + label + "[/bold]"
-            if step.result is not None:
-                title += Text.from_ansi(str(step)).markup
-            true_final = final = ""
-            border = PANEL_COLORS[depth % len(PANEL_COLORS)]
-            if isinstance(step.result, bool):
-                border = ["red", "green"][step.result]
-            if step.result is not None:
-                if isinstance(step.result, Exception):
-                    true_final = f"[bold red]{type(step.result).__name__}:[/bold red] {step.result}"
-                    if not step.children:
-                        final = true_final
-                    border = "red"
-                elif step.result is not step.children[-1].result:
-                    final = f"[bold]Result:[/bold] {step.result}"
-            title, final = (
-                Text.from_markup(title).markup,
-                Text.from_markup(final).markup,
-            )
-            res = Group(
-                title,
-                Padding(
-                    Group(
-                        *(
-                            rich(i, depth + 1, idx if p else 0)
-                            for idx, i in enumerate(step.children, 1)
-                        )
-                    ),
-                    (0, 0, 0, lpad),
-                ),
-                final,
-            )
-            res.step_header = (
-                (org_title + Text.from_ansi(step.header()).markup)
-                if not isinstance(step.result, Exception)
-                else " --> ".join((title, true_final))
-            )
-            res.collapsed = step._collapsed
-            if not step.children:
-                return res.step_header
-            if not final:
-                res.renderables.pop()
-            # return res
-            if depth == 0 or step.children and index and step.result is not None:
-                return Panel(res, border_style=border, expand=False, highlight=True)
-            return res
-
-        return rich(self, 0, 0)
+        return _rich(self, 0, 0, self._fold)
+
+    def iter_rich(self) -> Iterator[str | Group | Panel]:
+        """
+        The rendering in pieces: the title, each top-level step, then the
+        result. Printing them in turn shows the first lines right away
+        """
+        res = self.__rich__()
+        if isinstance(res, str):
+            yield res
+            return
+        title, body, *final = res.renderable.renderables
+        yield title
+        yield from body.renderable.renderables
+        yield from final
 
     def toJSON(self):
         def json(step: Step):
@@ -331,13 +399,129 @@ class Step:
         return json(self)
 
 
+PANEL_COLORS = ["#F0E68C", "#9370DB", "#87CEFA"]
+
+
+def _rich(step: Step, depth: int, index: int, fold: tuple | None):
+    """
+    The renderable of a step. Its children are only rendered once the
+    console (or the TUI) gets to them, so this is cheap however big the
+    explanation
+    """
+    # rich is only needed to render, not to record steps
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.padding import Padding
+
+    idx = str(index) + ". " if index else ""
+    lpad = bool(depth) + 1
+    label = step.reason + ": " if step.reason else ""
+    if not step.children and not isinstance(step.result, Exception):
+        return ansi_markup(idx + label) + header_markup(step)
+    p = len(step.children) > 1
+    lpad *= not len(step.children) or not bool(index) or not depth
+    org_title = title = "[bold]" + idx + label + "[/bold]"
+    if step.result is not None:
+        title += ansi_markup(str(step))
+    true_final = final = ""
+    border = PANEL_COLORS[depth % len(PANEL_COLORS)]
+    if isinstance(step.result, bool):
+        border = ["red", "green"][step.result]
+    if step.result is not None:
+        if isinstance(step.result, Exception):
+            true_final = f"[bold red]{type(step.result).__name__}:[/bold red] {step.result}"
+            if not step.children:
+                final = true_final
+            border = "red"
+        elif step.result is not step.children[-1].result:
+            final = f"[bold]Result:[/bold] {step.result}"
+    title, final = normalize_markup(title), normalize_markup(final)
+    collapsed = _folded(step, depth, fold)
+    if collapsed:
+        # Nothing below a collapsed step is collapsed once it is expanded
+        fold = None
+    res = _lazy_group(
+        lambda: (
+            _rich(i, depth + 1, idx if p else 0, fold)
+            for idx, i in enumerate(step.children, 1)
+        )
+    )
+    res = Group(title, Padding(res, (0, 0, 0, lpad)), final)
+    res.step_header = (
+        (org_title + header_markup(step))
+        if not isinstance(step.result, Exception)
+        else " --> ".join((title, true_final))
+    )
+    res.collapsed = collapsed
+    if not step.children:
+        return res.step_header
+    if not final:
+        res.renderables.pop()
+    if depth == 0 or step.children and index and step.result is not None:
+        return Panel(res, border_style=border, expand=False, highlight=True)
+    return res
+
+
+def _lazy_group(build: Callable[[], Iterable]) -> Group:
+    """A rich Group whose renderables are built when first needed"""
+    global _LazyGroup
+    if _LazyGroup is None:
+        from rich.console import Group
+
+        class LazyGroup(Group):
+            def __init__(self, build: Callable[[], Iterable]):
+                super().__init__()
+                self._build = build
+
+            @property
+            def renderables(self) -> list:
+                if self._render is None:
+                    self._render = list(self._build())
+                    self._build = None
+                return self._render
+
+        _LazyGroup = LazyGroup
+    return _LazyGroup(build)
+
+
+def _priority(val) -> int:
+    from datatypes.expr import Expr
+    from solving.core import Comparison, Interval, IntervalUnion, System
+
+    # To be revised
+    if isinstance(val, Expr):
+        return 1
+    if isinstance(val, (System, Comparison, Interval, IntervalUnion)):
+        return 2
+    # if isinstance(val, System):
+    #     return 3
+    if hasattr(val, "__iter__"):
+        return 1 + next(iter(val))
+    return 5
+
+
+def _origin(arg):
+    """The value an argument had before it was replaced by its step"""
+    return arg.result if arg.__class__ is Step else arg
+
+
+def _folded(step: Step, depth: int, fold: tuple | None) -> bool:
+    """Whether the step shows collapsed, under explain's `fold` setting"""
+    if fold is None or not step.children:
+        return False
+    maxdepth, adaptive, top = fold
+    return depth >= maxdepth and (
+        not adaptive or _priority(_origin(step.children[0].args[0])) < top
+    )
+
+
 def set_verbosity(value: bool) -> None:
     global _verbose
     _verbose = value
 
 
 def verbose() -> bool:
-    return _verbose
+    return _verbose and not _suppressed.get()
 
 
 def is_eq_priority(a, b) -> bool:
@@ -359,15 +543,19 @@ def _explain(expr) -> Step | Any:
         return res
     op = copy(res)
     res.children = []
+    args = list(res.args)
     for idx, i in enumerate(res.args):
         if type(i) is Step or not (v := _explain(i)):
             continue
-        res.args[idx] = v
+        # The step stands for the argument from now on: keep it alive
+        args[idx] = v
+        v.force_keep()
         if is_eq_priority(v.type, res.type) and v.children:
             res.children.extend(v.children)
         else:
             res.children.append(v)
         _steps.pop(id(v.result))
+    res.args = tuple(args)
 
     res.children.extend(op.children)
     if len(res.children) > len(op.children) and op.changed:
@@ -383,39 +571,16 @@ def explain(
 ) -> Step | None | Any:
     if not (res := _explain(expr)):
         return expr if default else None
-    if maxdepth is None:
-        return res
-
-    from datatypes.expr import Expr
-    from solving.core import Comparison, Interval, IntervalUnion, System
-
-    # To be revised
-    def priority(val):
-        if isinstance(val, Expr):
-            return 1
-        if isinstance(val, (System, Comparison, Interval, IntervalUnion)):
-            return 2
-        # if isinstance(val, System):
-        #     return 3
-        if hasattr(val, "__iter__"):
-            return 1 + next(iter(val))
-        return 5
-
-    def dfs(step: Step, depth):
-        if not step.children:
-            return step
-        if depth == 0 and (
-            not adaptive or priority(step.children[0]._args[0]) < priority(res._args[0])
-        ):
-            step._collapsed = True
-            return step
-        [dfs(i, max(0, depth - 1)) for i in step.children]
-        return step
-
-    return dfs(res, maxdepth)
+    if maxdepth is not None:
+        # Which steps show collapsed is decided as they are rendered
+        res._fold = (maxdepth, adaptive, _priority(_origin(res.args[0])))
+    return res
 
 
 _steps: dict[int, Step] = {}
+_LazyGroup = None
 _verbose: bool = False
+# Set by limit_trace around the calls it doesn't record, in their context only
+_suppressed: ContextVar[bool] = ContextVar("_suppressed", default=False)
 
 __all__ = ["Step", "verbose", "set_verbosity", "explain"]
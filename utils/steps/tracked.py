@@ -4,7 +4,6 @@ from contextlib import contextmanager
 from contextvars import ContextVar
 from copy import copy
 import inspect
-from wrapt import ObjectProxy
 from functools import update_wrapper
 from typing import Any, Callable, TypeVar, ParamSpec, Generic
 
@@ -18,16 +17,111 @@ R = TypeVar("R")
 @contextmanager
 def scoped(scope: list):
     ctx = _curr_hist.set(scope)
+    # Each scope is a level of the explanation: that's what maxdepth counts
+    if (limit := _limits.get()) is not None:
+        limit.depth += 1
     try:
         yield
     finally:
+        if limit is not None:
+            limit.depth -= 1
         _curr_hist.reset(ctx)
 
 
+@contextmanager
+def observe(callback: Callable[[steps.Step], Any]):
+    """
+    Call `callback` with each step of the enclosed top-level tracked calls
+    as soon as it is registered, rather than once the computation is done.
+    """
+    ctx = _observer.set(callback)
+    try:
+        yield
+    finally:
+        _observer.reset(ctx)
+
+
+@contextmanager
+def limit_trace(
+    maxdepth: int | None = None,
+    maxsteps: int | None = None,
+    maxchildren: int | None = None,
+):
+    """
+    Limit what the enclosed computation records, while it runs. Steps
+    nested in more than `maxdepth` scopes, tracked calls past the first
+    `maxsteps`, and steps past the first `maxchildren` of their parent
+    aren't recorded, and the calls that would make them run as if
+    verbosity was off. maxdepth=1 keeps the steps of the top-level call
+    without their sub-steps, but `maxdepth` doesn't bound the depth of the
+    explanation: a kept step still explains the intermediate results it
+    was given, when they were recorded.
+    """
+    ctx = _limits.set(TraceLimits(maxdepth, maxsteps, maxchildren))
+    try:
+        yield
+    finally:
+        _limits.reset(ctx)
+
+
+class TraceLimits:
+    """The limits of `limit_trace`, and how much was recorded so far"""
+
+    __slots__ = ("maxdepth", "maxsteps", "maxchildren", "depth", "steps")
+
+    def __init__(
+        self,
+        maxdepth: int | None = None,
+        maxsteps: int | None = None,
+        maxchildren: int | None = None,
+    ):
+        self.maxdepth = maxdepth
+        self.maxsteps = maxsteps
+        self.maxchildren = maxchildren
+        self.depth = self.steps = 0
+
+    def allows(self, scope: list | None) -> bool:
+        """Whether a step can be added to `scope`, the current call's steps"""
+        return (self.maxdepth is None or self.depth <= self.maxdepth) and (
+            self.maxchildren is None or scope is None or len(scope) < self.maxchildren
+        )
+
+    def run(self, record: Callable[..., R], func: Callable[..., R], args, kwargs) -> R:
+        if not self.allows(_curr_hist.get()) or (
+            self.maxsteps is not None and self.steps >= self.maxsteps
+        ):
+            # Nothing below is recorded either: skip the bookkeeping, in
+            # this context only
+            ctx = steps._suppressed.set(True)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                steps._suppressed.reset(ctx)
+        self.steps += 1
+        return record(*args, **kwargs)
+
+
+class _Observed(list):
+    __slots__ = ("callback",)
+
+    def __init__(self, callback: Callable[[steps.Step], Any]):
+        super().__init__()
+        self.callback = callback
+
+    def append(self, step: steps.Step) -> None:
+        super().append(step)
+        self.callback(step)
+
+
 def register(
     step: steps.Step | Any, scoped=True, reason=None, scope=None, changed_only=True
 ) -> None:
-    if not steps._verbose or scoped and _curr_hist.get() is None:
+    if (
+        not steps._verbose
+        or steps._suppressed.get()
+        or scoped
+        and _curr_hist.get() is None
+    ):
         return
     if type(step) is not steps.Step:
         step = steps._explain(step)
@@ -42,6 +136,8 @@ def register(
 
     ctx = scope if scope is not None else _curr_hist.get()
     if scoped and ctx is not None:
+        if (limit := _limits.get()) is not None and not limit.allows(ctx):
+            return
         if not changed_only or (step.changed or step.children):
             ctx.append(step)
             if step.result is not None:
@@ -74,10 +170,18 @@ class Tracked(Generic[P, R]):
         return types.MethodType(self, instance)
 
     def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
-        if not steps._verbose:
+        if not steps._verbose or steps._suppressed.get():
             return self.func(*args, **kwargs)
+        if (limit := _limits.get()) is not None:
+            return limit.run(self._record, self.func, args, kwargs)
+        return self._record(*args, **kwargs)
+
+    def _record(self, *args: P.args, **kwargs: P.kwargs) -> R:
         scope = _curr_hist.get()
-        with scoped(history := []):
+        history = []
+        if scope is None and (callback := _observer.get()) is not None:
+            history = _Observed(callback)
+        with scoped(history):
             try:
                 result = self.func(*args, **kwargs)
                 if steps._steps.get(id(result)) and not any(
@@ -94,7 +198,7 @@ class Tracked(Generic[P, R]):
         # if not keep:  # or steps._steps.get(id(result)):
         final = copy(result)
         if final is result:
-            final = ObjectProxy(final)
+            final = _proxy(final)
         steps._steps[id(final)] = steps.Step(
             self.id,
             args,
@@ -118,6 +222,20 @@ class Tracked(Generic[P, R]):
         return True
 
 
+def _proxy(value: Any) -> Any:
+    """A distinct object standing for `value`, that pickles as `value`"""
+    global _Proxy
+    if _Proxy is None:
+        from wrapt import ObjectProxy
+
+        class Proxy(ObjectProxy):
+            def __reduce_ex__(self, protocol):
+                return self.__wrapped__.__reduce_ex__(protocol)
+
+        _Proxy = Proxy
+    return _Proxy(value)
+
+
 def tracked(id: str = None, label: str = None):
     def wrapper(func: Callable[P, R]) -> Tracked[P, R]:
         return Tracked(func, id, label)
@@ -126,5 +244,8 @@ def tracked(id: str = None, label: str = None):
 
 
 _curr_hist = ContextVar("_curr_hist", default=None)
+_observer = ContextVar("_observer", default=None)
+_limits: ContextVar[TraceLimits | None] = ContextVar("_limits", default=None)
+_Proxy = None
 
-__all__ = ["tracked", "register", "scoped"]
+__all__ = ["tracked", "register", "scoped", "observe", "limit_trace", "TraceLimits"]